@@ -1,11 +1,45 @@
+import logging
+from functools import lru_cache
+
 from app.services import LLMEngine
 
+logger = logging.getLogger(__name__)
+
+# Dependencies are declared `async def` on purpose: FastAPI runs sync dependencies
+# in a threadpool on every request, while async ones are awaited on the event loop.
+# The engine itself is built once by the lru_cached factory below.
+
+
+@lru_cache(maxsize=1)
+def _build_llm_engine() -> LLMEngine:
+    """Build the shared LLM engine on first use."""
+    return LLMEngine()
+
 
-def get_llm_engine() -> LLMEngine:
+async def get_llm_engine() -> LLMEngine:
     """
     Get LLM engine instance for dependency injection.
 
     This function allows swapping the real implementation with a Mock in tests.
-    Returns a new instance each time (stateless service).
+    The engine holds no per-request state, so a single instance is built lazily
+    and shared across requests, reusing the underlying LLM client and its
+    connection pool.
     """
-    return LLMEngine()
+    return _build_llm_engine()
+
+
+async def warmup_llm_engine() -> None:
+    """Build the shared LLM engine and warm up its connection. Called on startup."""
+    try:
+        engine = _build_llm_engine()
+    except ValueError as e:
+        logger.warning("Skipping LLM warmup: %s", e)
+        return
+    await engine.warmup()
+
+
+async def close_llm_engine() -> None:
+    """Close the shared LLM engine's connections if it was built. Called on shutdown."""
+    if _build_llm_engine.cache_info().currsize:
+        await _build_llm_engine().aclose()
+        _build_llm_engine.cache_clear()
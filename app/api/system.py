@@ -1,36 +1,52 @@
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
-from app.core.config import settings
+from app.core.config import Settings, get_settings
 
 router = APIRouter()
 
 
+def _build_health_body(settings: Settings) -> bytes:
+    """
+    Build the serialized health check payload.
+
+    Settings are loaded once per process, so the payload is computed at import
+    time and served as-is on every probe.
+    """
+    try:
+        provider = settings.get_llm_provider()
+        model = settings.DEFAULT_MODEL
+    except ValueError:
+        provider = "not_configured"
+        model = "not_configured"
+
+    return orjson.dumps(
+        {
+            "status": "ok",
+            "environment": settings.ENVIRONMENT,
+            "llm_provider": provider,
+            "default_model": model,
+        }
+    )
+
+
+_HEALTH_BODY = _build_health_body(get_settings())
+
+
 @router.get(
     "/health",
     tags=["System"],
     summary="Health check endpoint",
     description="Simple endpoint to verify API is running. Useful for Kubernetes/Docker health probes.",
 )
-async def health_check() -> dict[str, str]:
+async def health_check() -> Response:
     """
     Health check endpoint.
 
     Returns basic status information about the API.
     Useful for monitoring and health probes in containerized environments.
     """
-    try:
-        provider = settings.get_llm_provider()
-        model = settings.DEFAULT_MODEL
-    except ValueError:
-        provider = "not_configured"
-        model = "not_configured"
-
-    return {
-        "status": "ok",
-        "environment": settings.ENVIRONMENT,
-        "llm_provider": provider,
-        "default_model": model,
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.get(
@@ -1,18 +1,36 @@
-import json
 import logging
 from collections.abc import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from app.api.dependencies import get_llm_engine
-from app.schemas import LessonRequest, Presentation
+from app.core.config import settings
+from app.schemas import (
+    BatchItemResult,
+    BatchLessonRequest,
+    BatchPresentationResponse,
+    LessonRequest,
+    Presentation,
+    Slide,
+)
 from app.services import LLMEngine, LLMGenerationError, LLMValidationError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Pre-encoded SSE framing
+_SSE_DATA_PREFIX = b"data: "
+_SSE_ERROR_PREFIX = b"event: error\ndata: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE_EVENT = b"event: done\ndata: [DONE]\n\n"
+
+# Serializes slides straight to JSON bytes in pydantic-core
+_slide_adapter = TypeAdapter(Slide)
+
 
 @router.post(
     "/slide",
@@ -41,25 +59,74 @@ async def generate_slides(
         presentation = await engine.generate_presentation(request)
         return presentation
     except LLMValidationError as e:
-        logger.error(f"Validation error generating slides: {str(e)}")
+        logger.error("Validation error generating slides: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Generated content doesn't match expected schema: {str(e)}",
         ) from e
     except LLMGenerationError as e:
-        logger.error(f"Generation error: {str(e)}")
+        logger.error("Generation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"AI generation failed: {str(e)}",
         ) from e
     except Exception as e:
-        logger.error(f"Unexpected error generating slides: {str(e)}", exc_info=True)
+        logger.error("Unexpected error generating slides: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again later.",
         ) from e
 
 
+def _batch_item_error(error: BaseException) -> str:
+    """Describe a failed batch item using the same messages as /slide."""
+    if isinstance(error, LLMValidationError):
+        logger.error("Validation error generating batch item: %s", error)
+        return f"Generated content doesn't match expected schema: {error}"
+    if isinstance(error, LLMGenerationError):
+        logger.error("Generation error in batch item: %s", error)
+        return f"AI generation failed: {error}"
+    logger.error("Unexpected error generating batch item: %s", error, exc_info=error)
+    return "An unexpected error occurred. Please try again later."
+
+
+@router.post(
+    "/slide/batch",
+    response_model=BatchPresentationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Generate several presentations",
+    description=(
+        "Generates up to 50 lesson presentations in a single call, with at most "
+        "max_concurrency generated at the same time. Each result holds either the "
+        "presentation or an error message, so one failed lesson does not fail the batch."
+    ),
+    response_description="One result per requested lesson, in request order",
+    tags=["Presentations"],
+)
+async def generate_slides_batch(
+    batch: BatchLessonRequest,
+    engine: LLMEngine = Depends(get_llm_engine),
+) -> BatchPresentationResponse:
+    """
+    Generate several presentations in one call.
+
+    Lessons are generated concurrently by the engine, bounded by max_concurrency.
+    """
+    outcomes = await engine.generate_presentations(
+        batch.requests, max_concurrency=batch.max_concurrency
+    )
+
+    results = [
+        (
+            BatchItemResult(error=_batch_item_error(outcome))
+            if isinstance(outcome, BaseException)
+            else BatchItemResult(presentation=outcome)
+        )
+        for outcome in outcomes
+    ]
+    return BatchPresentationResponse(results=results)
+
+
 @router.post(
     "/streaming",
     summary="Stream presentation slide by slide",
@@ -88,43 +155,46 @@ async def generate_slides_stream(
     - event: error, data: {error JSON} - If an error occurs
     """
 
-    async def sse_generator() -> AsyncGenerator[str, None]:
+    async def sse_generator() -> AsyncGenerator[bytes, None]:
         slide_count = 0
+        # Events are coalesced here and flushed per slide, or once the buffer
+        # fills when SSE_FLUSH_EACH_SLIDE is disabled
+        buffer = bytearray()
         try:
             async for slide in engine.stream_presentation(request):
                 slide_count += 1
-                data = json.dumps(slide.model_dump(), ensure_ascii=False)
-                yield f"data: {data}\n\n"
+                buffer += _SSE_DATA_PREFIX
+                buffer += _slide_adapter.dump_json(slide)
+                buffer += _SSE_SUFFIX
+                if settings.SSE_FLUSH_EACH_SLIDE or len(buffer) >= settings.SSE_BUFFER_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
 
-            yield "event: done\ndata: [DONE]\n\n"
-            logger.info(f"Successfully streamed {slide_count} slides")
+            buffer += _SSE_DONE_EVENT
+            logger.info("Successfully streamed %d slides", slide_count)
 
         except LLMValidationError as e:
-            logger.error(f"Validation error in stream: {e}")
-            error_data = json.dumps(
-                {"error": "Validation error", "detail": str(e)}, ensure_ascii=False
-            )
-            yield f"event: error\ndata: {error_data}\n\n"
+            logger.error("Validation error in stream: %s", e)
+            error_data = orjson.dumps({"error": "Validation error", "detail": str(e)})
+            buffer += _SSE_ERROR_PREFIX + error_data + _SSE_SUFFIX
         except LLMGenerationError as e:
-            logger.error(f"Generation error in stream: {e}")
-            error_data = json.dumps(
-                {"error": "Generation error", "detail": str(e)}, ensure_ascii=False
-            )
-            yield f"event: error\ndata: {error_data}\n\n"
+            logger.error("Generation error in stream: %s", e)
+            error_data = orjson.dumps({"error": "Generation error", "detail": str(e)})
+            buffer += _SSE_ERROR_PREFIX + error_data + _SSE_SUFFIX
         except Exception as e:
-            logger.error(f"Error in stream: {e}", exc_info=True)
-            error_data = json.dumps(
-                {"error": "Unexpected error", "detail": str(e)}, ensure_ascii=False
-            )
-            yield f"event: error\ndata: {error_data}\n\n"
+            logger.error("Error in stream: %s", e, exc_info=True)
+            error_data = orjson.dumps({"error": "Unexpected error", "detail": str(e)})
+            buffer += _SSE_ERROR_PREFIX + error_data + _SSE_SUFFIX
+
+        yield bytes(buffer)
 
     return StreamingResponse(
         sse_generator(),
-        media_type="text/event-stream; charset=utf-8",
+        # Starlette appends "; charset=utf-8" and the server handles chunked framing
+        media_type="text/event-stream",
         headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
-            "Transfer-Encoding": "chunked",
         },
     )
@@ -1,3 +1,3 @@
-from app.core.config import Settings, settings
+from app.core.config import Settings, get_settings, settings
 
-__all__ = ["Settings", "settings"]
+__all__ = ["Settings", "get_settings", "settings"]
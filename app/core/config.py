@@ -1,4 +1,6 @@
-from pydantic import field_validator
+from functools import lru_cache
+
+from pydantic import PrivateAttr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,6 +22,27 @@ class Settings(BaseSettings):
     DEFAULT_TEMPERATURE: float = 0.5
     DEFAULT_MAX_RETRIES: int = 2
     DEFAULT_TIMEOUT: int | None = None
+    LLM_MAX_CONCURRENCY: int = 5
+    LLM_BATCH_CONTENT_SLIDES: bool = False
+    LLM_BATCH_META_SLIDES: bool = False
+    LLM_WARMUP_ON_STARTUP: bool = True
+
+    # LLM Response Cache (exact-match, in-process; size 0 disables)
+    LLM_CACHE_MAX_SIZE: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 600
+
+    # Semantic Presentation Cache (optional, requires the semantic-cache extra)
+    SEMANTIC_CACHE_REDIS_URL: str | None = None
+    SEMANTIC_CACHE_DISTANCE_THRESHOLD: float = 0.1
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    SEMANTIC_CACHE_AGENDAS: bool = False
+
+    # SSE Streaming
+    SSE_FLUSH_EACH_SLIDE: bool = True
+    SSE_BUFFER_SIZE: int = 4096
+
+    # Resolved once at load time, see model_post_init
+    _llm_provider: str | None = PrivateAttr(default=None)
 
     @field_validator("DEFAULT_TIMEOUT", mode="before")
     @classmethod
@@ -45,13 +68,36 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-    def get_llm_provider(self) -> str:
-        """Get the configured LLM provider, with fallback logic."""
+    def model_post_init(self, __context: object) -> None:
+        """Resolve the LLM provider once, since settings don't change after load."""
+        self._llm_provider = self._resolve_llm_provider()
+
+    def _resolve_llm_provider(self) -> str | None:
+        """Select the LLM provider from the configured keys, with fallback logic."""
         if self.DEFAULT_LLM_PROVIDER == "openai" and self.OPENAI_API_KEY:
             return "openai"
         if self.GOOGLE_API_KEY:
             return "google"
-        raise ValueError("No LLM provider configured. Please set OPENAI_API_KEY or GOOGLE_API_KEY")
+        return None
+
+    def get_llm_provider(self) -> str:
+        """Get the configured LLM provider, with fallback logic."""
+        if self._llm_provider is None:
+            raise ValueError(
+                "No LLM provider configured. Please set OPENAI_API_KEY or GOOGLE_API_KEY"
+            )
+        return self._llm_provider
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings.
+
+    The .env file is parsed only once; the same instance is returned on every call,
+    which also makes this usable as a FastAPI dependency.
+    """
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
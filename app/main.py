@@ -1,10 +1,29 @@
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import system
+from app.api.dependencies import close_llm_engine, warmup_llm_engine
 from app.api.v1 import endpoints as v1_endpoints
 from app.core.config import settings
+from app.services.semantic_cache import close_semantic_cache, open_semantic_cache
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Build the semantic cache and warm up the LLM on startup; release both on shutdown."""
+    await open_semantic_cache()
+    if settings.LLM_WARMUP_ON_STARTUP:
+        await warmup_llm_engine()
+    yield
+    await close_llm_engine()
+    await close_semantic_cache()
+
 
 app = FastAPI(
     title="AI Slide Deck Generation Service",
@@ -16,28 +35,23 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
-def get_cors_origins() -> list[str]:
-    """
-    Get CORS allowed origins from settings or use defaults.
-
-    Returns:
-        List of allowed origin URLs.
-    """
-    return [
-        "http://localhost",
-        "http://localhost:3000",
-        "http://localhost:8080",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:8080",
-    ]
-
+# CORS allowed origins
+CORS_ORIGINS: tuple[str, ...] = (
+    "http://localhost",
+    "http://localhost:3000",
+    "http://localhost:8080",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:8080",
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=get_cors_origins(),
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
@@ -55,4 +69,7 @@ if __name__ == "__main__":
         port=8000,
         reload=settings.ENVIRONMENT == "development",
         log_level=settings.LOG_LEVEL.lower(),
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
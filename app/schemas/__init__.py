@@ -1,11 +1,19 @@
+from app.schemas.agenda import Agenda
+from app.schemas.batch import BatchItemResult, BatchLessonRequest, BatchPresentationResponse
 from app.schemas.enums import SlideType
 from app.schemas.presentation import Presentation
 from app.schemas.question import Question
 from app.schemas.request import LessonRequest
-from app.schemas.slide import Slide
+from app.schemas.slide import ContentSlides, MetaSlides, Slide
 
 __all__ = [
+    "Agenda",
+    "BatchItemResult",
+    "BatchLessonRequest",
+    "BatchPresentationResponse",
+    "ContentSlides",
     "LessonRequest",
+    "MetaSlides",
     "Presentation",
     "Question",
     "Slide",
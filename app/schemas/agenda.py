@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class Agenda(BaseModel):
+    """
+    Planned agenda for a lesson.
+
+    Structured output of the agenda planning step: one subtopic per content slide,
+    in presentation order.
+    """
+
+    subtopics: list[str] = Field(
+        ...,
+        min_length=1,
+        description="Subtopic titles, one per content slide",
+        examples=[["What is Photosynthesis?", "The Light-Dependent Reactions"]],
+    )
@@ -0,0 +1,62 @@
+"""
+Batch models for generating several presentations in one API call.
+
+Each lesson in a batch is generated independently; failures are reported
+per item so one bad request does not fail the whole batch.
+"""
+
+from pydantic import BaseModel, Field
+
+from app.schemas.presentation import Presentation
+from app.schemas.request import LessonRequest
+
+
+class BatchLessonRequest(BaseModel):
+    """
+    Request model for batch slide deck generation.
+
+    Wraps a list of lesson requests together with the maximum number of
+    presentations generated at the same time.
+    """
+
+    requests: list[LessonRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Lessons to generate. Limited to 50 per call for cost control.",
+    )
+
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=10,
+        description="Maximum number of presentations generated concurrently",
+        examples=[4],
+    )
+
+
+class BatchItemResult(BaseModel):
+    """
+    Result for a single lesson in a batch.
+
+    Exactly one of presentation or error is set.
+    """
+
+    presentation: Presentation | None = Field(
+        default=None,
+        description="The generated presentation, if generation succeeded",
+    )
+    error: str | None = Field(
+        default=None,
+        description="Error message, if generation failed",
+        examples=["AI generation failed: API Error"],
+    )
+
+
+class BatchPresentationResponse(BaseModel):
+    """Response model for batch generation, with one result per requested lesson."""
+
+    results: list[BatchItemResult] = Field(
+        ...,
+        description="Results in the same order as the submitted requests",
+    )
@@ -56,58 +56,56 @@ class Presentation(BaseModel):
         - At least one content slide exists
         - Only one question exists (if any) and it's in a content slide
         """
-        if not self.slides:
-            raise ValueError("Presentation must contain at least one slide")
+        # min_length=3 on slides is enforced before this validator runs
+        slides = self.slides
+        last_idx = len(slides) - 1
 
         # Validate first slide is title
-        if self.slides[0].type != SlideType.TITLE:
+        if slides[0].type is not SlideType.TITLE:
             raise ValueError(
-                f"First slide must be of type '{SlideType.TITLE}', "
-                f"but got '{self.slides[0].type}'"
+                f"First slide must be of type '{SlideType.TITLE}', but got '{slides[0].type}'"
             )
 
         # Validate second slide is agenda
-        if len(self.slides) < 2 or self.slides[1].type != SlideType.AGENDA:
+        if slides[1].type is not SlideType.AGENDA:
             raise ValueError(
-                f"Second slide must be of type '{SlideType.AGENDA}', "
-                f"but got '{self.slides[1].type if len(self.slides) > 1 else 'none'}'"
+                f"Second slide must be of type '{SlideType.AGENDA}', but got '{slides[1].type}'"
             )
 
         # Validate last slide is conclusion
-        if self.slides[-1].type != SlideType.CONCLUSION:
+        if slides[last_idx].type is not SlideType.CONCLUSION:
             raise ValueError(
                 f"Last slide must be of type '{SlideType.CONCLUSION}', "
-                f"but got '{self.slides[-1].type}'"
+                f"but got '{slides[last_idx].type}'"
             )
 
-        # Validate middle slides are all content slides
-        content_slides = self.slides[2:-1]
-        if not content_slides:
+        # Validate middle slides exist
+        if last_idx < 3:
             raise ValueError(
                 "Presentation must contain at least one content slide between agenda and conclusion"
             )
 
-        for idx, slide in enumerate(content_slides, start=2):
-            if slide.type != SlideType.CONTENT:
+        # Single pass: middle slides are content, at most one question, only in content slides
+        content = SlideType.CONTENT
+        question_count = 0
+        for idx, slide in enumerate(slides):
+            if 2 <= idx < last_idx and slide.type is not content:
                 raise ValueError(
-                    f"Slide at position {idx + 1} must be of type '{SlideType.CONTENT}', "
+                    f"Slide at position {idx + 1} must be of type '{content}', "
                     f"but got '{slide.type}'"
                 )
-
-        # Validate that at most one question exists
-        questions = [slide for slide in self.slides if slide.question is not None]
-        if len(questions) > 1:
-            raise ValueError(
-                f"Presentation can contain at most one question, but found {len(questions)}"
-            )
-
-        # Validate question is in a content slide (middle of presentation)
-        if questions:
-            question_slide = questions[0]
-            if question_slide.type != SlideType.CONTENT:
+            if slide.question is None:
+                continue
+            if slide.type is not content:
                 raise ValueError(
                     "Questions can only be included in content slides, "
-                    f"but found question in {question_slide.type} slide"
+                    f"but found question in {slide.type} slide"
                 )
+            question_count += 1
+
+        if question_count > 1:
+            raise ValueError(
+                f"Presentation can contain at most one question, but found {question_count}"
+            )
 
         return self
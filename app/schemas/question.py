@@ -55,8 +55,8 @@ class Question(BaseModel):
 
         # Check if answer is a single letter that matches option labels
         if len(answer_normalized) == 1 and answer_normalized.isalpha():
-            option_labels = [opt[0] if opt else "" for opt in options_normalized]
-            if answer_normalized.upper() in [label.upper() for label in option_labels]:
+            option_labels = {opt[:1].upper() for opt in options_normalized}
+            if answer_normalized.upper() in option_labels:
                 return self
 
         raise ValueError(
@@ -10,6 +10,9 @@ from pydantic import BaseModel, Field, model_validator
 from app.schemas.enums import SlideType
 from app.schemas.question import Question
 
+# Slide types that may not carry a question
+_NON_QUESTION_TYPES = frozenset({SlideType.TITLE, SlideType.AGENDA, SlideType.CONCLUSION})
+
 
 class Slide(BaseModel):
     """
@@ -74,10 +77,36 @@ class Slide(BaseModel):
         - Title, agenda, and conclusion slides should not have questions
         - Only content slides can have questions
         """
-        if self.type in (SlideType.TITLE, SlideType.AGENDA, SlideType.CONCLUSION):
-            if self.question is not None:
-                raise ValueError(
-                    f"Questions can only be included in content slides, not in {self.type} slides"
-                )
+        if self.question is not None and self.type in _NON_QUESTION_TYPES:
+            raise ValueError(
+                f"Questions can only be included in content slides, not in {self.type} slides"
+            )
 
         return self
+
+
+class ContentSlides(BaseModel):
+    """
+    Content slides of a presentation generated together in a single LLM call.
+
+    Slides are in presentation order, one per planned subtopic.
+    """
+
+    slides: list[Slide] = Field(
+        ...,
+        min_length=1,
+        description="Content slides in presentation order",
+    )
+
+
+class MetaSlides(BaseModel):
+    """
+    Title, agenda, and conclusion slides generated together in a single LLM call.
+
+    These slides depend only on the topic and the planned subtopics, so they
+    can be produced without waiting for the content slides.
+    """
+
+    title: Slide = Field(..., description="The title slide")
+    agenda: Slide = Field(..., description="The agenda slide")
+    conclusion: Slide = Field(..., description="The conclusion slide")
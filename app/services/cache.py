@@ -0,0 +1,95 @@
+"""
+In-process response cache for LLM calls.
+
+Identical agenda and slide requests are served from memory instead of
+re-hitting the provider.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-entry time-to-live.
+
+    Entries are evicted least-recently-used first once maxsize is reached,
+    and are treated as missing once older than ttl seconds. A maxsize of 0
+    disables the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept.
+            ttl: Entry lifetime in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Return the cached value for key, or None on a miss or expired entry.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached value, or None.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store value under key, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_cache_key(**fields: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable fields.
+
+    Fields are serialized with sorted keys so argument order does not matter.
+
+    Args:
+        **fields: Values identifying the cached call.
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form.
+    """
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -1,29 +1,53 @@
-import json
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 
+import httpx
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
-from pydantic import SecretStr, ValidationError
+from pydantic import SecretStr, TypeAdapter, ValidationError
 
 from app.core.config import settings
-from app.schemas import LessonRequest, Presentation, Slide
+from app.schemas import Agenda, ContentSlides, LessonRequest, MetaSlides, Presentation, Slide
 from app.schemas.enums import SlideType
+from app.services.cache import ResponseCache, make_cache_key
 from app.services.prompts import (
     AGENDA_PLANNING_PROMPT,
     AGENDA_SLIDE_PROMPT,
+    AGENDA_SYSTEM_PROMPT,
     CONCLUSION_SLIDE_PROMPT,
-    CONTENT_SLIDE_PROMPT,
+    CONTENT_SLIDE_PROMPTS,
+    CONTENT_SLIDES_PROMPT,
+    META_SLIDES_PROMPT,
+    SLIDE_LESSON_PROMPT,
     SLIDE_SYSTEM_PROMPT,
-    SYSTEM_PROMPT,
     TITLE_SLIDE_PROMPT,
-    USER_PROMPT_TEMPLATE,
 )
+from app.services.semantic_cache import get_semantic_cache
 
 logger = logging.getLogger(__name__)
 
+# Connection limits for the pooled HTTP client shared by all provider calls
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Static system prompts are added as literal messages so they are never re-formatted
+_AGENDA_SYSTEM_MESSAGE = SystemMessage(content=AGENDA_SYSTEM_PROMPT)
+_SLIDE_SYSTEM_MESSAGE = SystemMessage(content=SLIDE_SYSTEM_PROMPT)
+
+# Exact-match cache shared by all engines, keyed by provider/model and call inputs
+_response_cache = ResponseCache(
+    maxsize=settings.LLM_CACHE_MAX_SIZE,
+    ttl=settings.LLM_CACHE_TTL_SECONDS,
+)
+
+# Cached slides are stored as JSON bytes and rebuilt with these adapters
+_slide_adapter = TypeAdapter(Slide)
+_slides_adapter = TypeAdapter(list[Slide])
+_meta_slides_adapter = TypeAdapter(MetaSlides)
+
 
 class LLMEngineError(Exception):
     """Base exception for LLM engine errors."""
@@ -69,8 +93,16 @@ class LLMEngine:
         self.model = model or self._get_default_model()
         self.temperature = temperature or settings.DEFAULT_TEMPERATURE
 
+        self._http_client: httpx.AsyncClient | None = None
         self.llm = self._initialize_llm()
-        self._chain: Runnable | None = None
+
+        # Chains are built once; per-call inputs are passed as template variables
+        self._agenda_chain = self._build_agenda_chain()
+        slide_llm = self.llm.with_structured_output(Slide)
+        self._slide_chains = self._build_slide_chains(slide_llm)
+        self._content_slide_chains = self._build_content_slide_chains(slide_llm)
+        self._content_slides_chain = self._build_content_slides_chain()
+        self._meta_slides_chain = self._build_meta_slides_chain()
 
     def _get_default_model(self) -> str:
         """Get default model for the selected provider."""
@@ -91,12 +123,19 @@ class LLMEngine:
         if self.provider == "openai":
             if not settings.OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY is required for OpenAI provider")
+            # One HTTP/2 pool for all concurrent slide calls instead of a handshake each
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                limits=_HTTP_LIMITS,
+                timeout=settings.DEFAULT_TIMEOUT,
+            )
             return ChatOpenAI(
                 model=self.model,
                 temperature=self.temperature,
                 api_key=SecretStr(settings.OPENAI_API_KEY),
                 timeout=settings.DEFAULT_TIMEOUT,
                 max_retries=settings.DEFAULT_MAX_RETRIES,
+                http_async_client=self._http_client,
             )
 
         if self.provider == "google":
@@ -112,45 +151,118 @@ class LLMEngine:
 
         raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
-    def _build_chain(self, request: LessonRequest) -> Runnable:
+    async def warmup(self) -> None:
         """
-        Build the LangChain chain for presentation generation.
+        Open the provider connection ahead of the first real request.
 
-        Args:
-            request: Lesson request with all parameters.
-
-        Returns:
-            Configured LangChain Runnable chain.
+        Sends a one-token request so the TLS handshake and connection setup are
+        not paid by the first user. Failures are logged and otherwise ignored.
         """
-        # Format all prompts completely before creating ChatPromptTemplate
-        system_prompt = SYSTEM_PROMPT.format(
-            n_slides=request.n_slides,
-            grade=request.grade,
-            context=request.context or "No specific context provided.",
-        )
+        if self.provider == "openai":
+            limit = {"max_tokens": 1}
+        else:
+            limit = {"generation_config": {"max_output_tokens": 1}}
+
+        try:
+            await self.llm.ainvoke("ping", **limit)
+            logger.info("LLM connection warmed up (provider: %s)", self.provider)
+        except Exception as e:
+            logger.warning("LLM warmup failed: %s", e)
 
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            topic=request.topic,
-            grade=request.grade,
-            n_slides=request.n_slides,
-            context=request.context or "No specific context provided.",
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool used by the provider client, if any."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _build_agenda_chain(self) -> Runnable:
+        """Build the chain used to plan the lesson agenda."""
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                _AGENDA_SYSTEM_MESSAGE,
+                ("user", AGENDA_PLANNING_PROMPT),
+            ]
         )
+        return prompt | self.llm.with_structured_output(Agenda)
 
+    @staticmethod
+    def _build_slide_chain(user_prompt: str, slide_llm: Runnable) -> Runnable:
+        """Build a single-slide chain for the given user prompt."""
         prompt = ChatPromptTemplate.from_messages(
             [
-                ("system", system_prompt),
+                _SLIDE_SYSTEM_MESSAGE,
+                ("system", SLIDE_LESSON_PROMPT),
                 ("user", user_prompt),
             ]
         )
+        return prompt | slide_llm
+
+    def _build_slide_chains(self, slide_llm: Runnable) -> dict[SlideType, Runnable]:
+        """Build one structured-output chain per non-content slide type."""
+        user_prompts = {
+            SlideType.TITLE: TITLE_SLIDE_PROMPT,
+            SlideType.AGENDA: AGENDA_SLIDE_PROMPT,
+            SlideType.CONCLUSION: CONCLUSION_SLIDE_PROMPT,
+        }
+        return {
+            slide_type: self._build_slide_chain(user_prompt, slide_llm)
+            for slide_type, user_prompt in user_prompts.items()
+        }
+
+    def _build_content_slide_chains(self, slide_llm: Runnable) -> dict[tuple[bool, bool], Runnable]:
+        """Build one content slide chain per (include_image, include_question) variant."""
+        return {
+            variant: self._build_slide_chain(user_prompt, slide_llm)
+            for variant, user_prompt in CONTENT_SLIDE_PROMPTS.items()
+        }
+
+    def _build_content_slides_chain(self) -> Runnable:
+        """Build the chain that generates all content slides in one call."""
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                _SLIDE_SYSTEM_MESSAGE,
+                ("system", SLIDE_LESSON_PROMPT),
+                ("user", CONTENT_SLIDES_PROMPT),
+            ]
+        )
+        return prompt | self.llm.with_structured_output(ContentSlides)
 
-        # Use structured output to ensure Pydantic validation
-        structured_llm = self.llm.with_structured_output(Presentation)
-
-        return prompt | structured_llm
+    def _build_meta_slides_chain(self) -> Runnable:
+        """Build the chain that generates the title, agenda, and conclusion slides."""
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                _SLIDE_SYSTEM_MESSAGE,
+                ("system", SLIDE_LESSON_PROMPT),
+                ("user", META_SLIDES_PROMPT),
+            ]
+        )
+        return prompt | self.llm.with_structured_output(MetaSlides)
+
+    @staticmethod
+    def _ensure_type(slide: Slide, slide_type: SlideType) -> Slide:
+        """Return the slide with its type set to slide_type."""
+        if slide.type == slide_type:
+            return slide
+        if slide.question is not None and slide_type is not SlideType.CONTENT:
+            # Re-validate so a question on a non-content slide is still rejected
+            return Slide(
+                type=slide_type,
+                title=slide.title,
+                content=slide.content,
+                image=slide.image,
+                question=slide.question,
+            )
+        # Fields are already validated; only the type changes
+        return slide.model_copy(update={"type": slide_type})
 
     async def generate_presentation(self, request: LessonRequest) -> Presentation:
         """
-        Generate a complete presentation synchronously.
+        Generate a complete presentation.
+
+        Consumes the slide-by-slide generator used by streaming and assembles
+        the slides into a Presentation, so both endpoints share one generation path.
+        When the semantic cache is configured, a presentation generated for a
+        similar request is returned instead.
 
         Args:
             request: Lesson request with topic, grade, context, and n_slides.
@@ -163,87 +275,146 @@ class LLMEngine:
             LLMValidationError: If output doesn't match schema.
         """
         logger.info(
-            f"Generating presentation (provider: {self.provider}, model: {self.model}) "
-            f"for topic: {request.topic}, grade: {request.grade}, "
-            f"n_slides: {request.n_slides}"
+            "Generating presentation (provider: %s, model: %s) "
+            "for topic: %s, grade: %s, n_slides: %d",
+            self.provider,
+            self.model,
+            request.topic,
+            request.grade,
+            request.n_slides,
         )
 
-        try:
-            # Build chain with request-specific parameters
-            chain = self._build_chain(request)
-
-            # Invoke chain asynchronously
-            result = await chain.ainvoke({})
-
-            # Validate result is a Presentation instance
-            if not isinstance(result, Presentation):
-                raise LLMValidationError(
-                    f"LLM returned unexpected type: {type(result)}. " f"Expected Presentation."
-                )
+        semantic_cache = get_semantic_cache()
+        if semantic_cache is not None:
+            cached = await semantic_cache.lookup_presentation(request)
+            if cached is not None:
+                logger.info("Serving presentation from semantic cache")
+                return cached
 
-            logger.info(f"Successfully generated presentation with {len(result.slides)} slides")
-            return result
+        slides = [slide async for slide in self.stream_presentation(request)]
 
+        try:
+            result = Presentation(topic=request.topic, grade=request.grade, slides=slides)
         except ValidationError as e:
-            logger.error(f"Pydantic validation error: {e}")
+            logger.error("Pydantic validation error: %s", e)
             raise LLMValidationError(
                 f"Generated content doesn't match Presentation schema: {e}"
             ) from e
-        except Exception as e:
-            logger.error(f"Error generating presentation: {e}", exc_info=True)
-            raise LLMGenerationError(f"Failed to generate presentation: {str(e)}") from e
+
+        logger.info("Successfully generated presentation with %d slides", len(result.slides))
+
+        if semantic_cache is not None:
+            await semantic_cache.store_presentation(request, result)
+        return result
+
+    async def generate_presentations(
+        self,
+        requests: list[LessonRequest],
+        max_concurrency: int | None = None,
+    ) -> list[Presentation | BaseException]:
+        """
+        Generate several presentations as one batch.
+
+        Requests are generated concurrently and share the engine's LLM client.
+
+        Args:
+            requests: Lesson requests to generate.
+            max_concurrency: Maximum number of presentations generated at once.
+                If None, all requests run concurrently.
+
+        Returns:
+            One entry per request, in the same order: the generated Presentation,
+            or the exception raised while generating it.
+        """
+        if max_concurrency is None:
+            return await asyncio.gather(
+                *(self.generate_presentation(request) for request in requests),
+                return_exceptions=True,
+            )
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate_bounded(request: LessonRequest) -> Presentation:
+            async with semaphore:
+                return await self.generate_presentation(request)
+
+        return await asyncio.gather(
+            *(generate_bounded(request) for request in requests),
+            return_exceptions=True,
+        )
+
+    def _cache_key(self, kind: str, request: LessonRequest, **params) -> str:
+        """
+        Build the response cache key for an LLM call.
+
+        Request fields are normalized first (whitespace collapsed, topic and grade
+        case-folded) so trivially different spellings share a cache entry.
+
+        Args:
+            kind: Call kind, e.g. "agenda" or a slide type.
+            request: Lesson request the call is made for.
+            **params: Additional call parameters.
+
+        Returns:
+            Cache key string.
+        """
+        return make_cache_key(
+            provider=self.provider,
+            model=self.model,
+            temperature=self.temperature,
+            kind=kind,
+            request={
+                "topic": " ".join(request.topic.split()).casefold(),
+                "grade": " ".join(request.grade.split()).casefold(),
+                "context": " ".join(request.context.split()),
+                "n_slides": request.n_slides,
+            },
+            params=params,
+        )
 
     async def _plan_agenda(self, request: LessonRequest) -> list[str]:
         """
         Plan the agenda/subtopics for the presentation.
 
+        Identical requests are served from the response cache. With
+        SEMANTIC_CACHE_AGENDAS, an agenda planned for a similar request is reused.
+
         Args:
             request: Lesson request with topic, grade, context, and n_slides.
 
         Returns:
             List of subtopic strings for content slides.
         """
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You are an educational content planner. Return ONLY valid JSON.",
-                ),
-                (
-                    "user",
-                    AGENDA_PLANNING_PROMPT.format(
-                        topic=request.topic,
-                        grade=request.grade,
-                        n_slides=request.n_slides,
-                        context=request.context or "No specific context provided.",
-                    ),
-                ),
-            ]
+        cache_key = self._cache_key("agenda", request)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        # Opt-in: the lookup adds an embedding and a Redis round-trip to every stream
+        semantic_cache = get_semantic_cache() if settings.SEMANTIC_CACHE_AGENDAS else None
+        if semantic_cache is not None:
+            similar = await semantic_cache.lookup_agenda(request)
+            if similar is not None:
+                _response_cache.set(cache_key, similar)
+                return list(similar)
+
+        result = await self._agenda_chain.ainvoke(
+            {
+                "topic": request.topic,
+                "grade": request.grade,
+                "n_slides": request.n_slides,
+                "context": request.context or "No specific context provided.",
+            }
         )
 
-        chain = prompt | self.llm
-        result = await chain.ainvoke({})
+        if not isinstance(result, Agenda):
+            raise LLMValidationError(f"Expected Agenda, got {type(result)}")
 
-        # Parse the JSON array from the response
-        content = result.content if hasattr(result, "content") else str(result)
-
-        # Clean up the response - remove markdown code blocks if present
-        content = content.strip()
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1] if "\n" in content else content[3:]
-        if content.endswith("```"):
-            content = content.rsplit("```", 1)[0]
-        content = content.strip()
-
-        try:
-            subtopics = json.loads(content)
-            if not isinstance(subtopics, list):
-                raise ValueError("Expected a list of subtopics")
-            return subtopics[: request.n_slides]  # Ensure correct count
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning(f"Failed to parse agenda planning response: {e}")
-            # Fallback: generate generic subtopics
-            return [f"Topic {i + 1}" for i in range(request.n_slides)]
+        subtopics = result.subtopics[: request.n_slides]  # Ensure correct count
+        _response_cache.set(cache_key, subtopics)
+        if semantic_cache is not None:
+            await semantic_cache.store_agenda(request, subtopics)
+        return list(subtopics)
 
     async def _generate_single_slide(
         self,
@@ -262,89 +433,157 @@ class LLMEngine:
         Returns:
             Generated Slide object.
         """
-        system_prompt = SLIDE_SYSTEM_PROMPT.format(
-            grade=request.grade,
-            context=request.context or "No specific context provided.",
-        )
+        cache_key = self._cache_key(slide_type.value, request, **kwargs)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _slide_adapter.validate_json(cached)
 
-        if slide_type == SlideType.TITLE:
-            user_prompt = TITLE_SLIDE_PROMPT.format(topic=request.topic)
-        elif slide_type == SlideType.AGENDA:
-            agenda_items = "\n".join(f"- {item}" for item in kwargs.get("subtopics", []))
-            user_prompt = AGENDA_SLIDE_PROMPT.format(
-                topic=request.topic,
-                n_slides=request.n_slides,
-                agenda_items=agenda_items,
-            )
-        elif slide_type == SlideType.CONTENT:
-            slide_number = kwargs.get("slide_number", 1)
-            total_slides = kwargs.get("total_content_slides", request.n_slides)
-            subtopic = kwargs.get("subtopic", "")
+        if slide_type == SlideType.CONTENT:
             include_image = kwargs.get("include_image", False)
             include_question = kwargs.get("include_question", False)
-
-            image_instruction = (
-                '- Include an "image" field with a relevant search query for an image'
-                if include_image
-                else ""
-            )
-            question_instruction = (
-                '- Include a "question" field with a multiple choice question '
-                "(prompt, options array with 4 choices, and answer)"
-                if include_question
-                else ""
-            )
-
-            user_prompt = CONTENT_SLIDE_PROMPT.format(
-                topic=request.topic,
-                slide_number=slide_number,
-                total_content_slides=total_slides,
-                subtopic=subtopic,
-                image_instruction=image_instruction,
-                question_instruction=question_instruction,
-            )
-        elif slide_type == SlideType.CONCLUSION:
-            covered_topics = "\n".join(f"- {item}" for item in kwargs.get("subtopics", []))
-            user_prompt = CONCLUSION_SLIDE_PROMPT.format(
-                topic=request.topic,
-                covered_topics=covered_topics,
-            )
+            chain = self._content_slide_chains[(include_image, include_question)]
         else:
+            chain = self._slide_chains.get(slide_type)
+        if chain is None:
             raise ValueError(f"Unknown slide type: {slide_type}")
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", system_prompt),
-                ("user", user_prompt),
-            ]
-        )
+        variables = {
+            "topic": request.topic,
+            "grade": request.grade,
+            "context": request.context or "No specific context provided.",
+        }
 
-        structured_llm = self.llm.with_structured_output(Slide)
-        chain = prompt | structured_llm
+        if slide_type == SlideType.AGENDA:
+            variables["n_slides"] = request.n_slides
+            variables["agenda_items"] = kwargs.get("agenda_items", "")
+        elif slide_type == SlideType.CONTENT:
+            variables["slide_number"] = kwargs.get("slide_number", 1)
+            variables["total_content_slides"] = kwargs.get("total_content_slides", request.n_slides)
+            variables["subtopic"] = kwargs.get("subtopic", "")
+        elif slide_type == SlideType.CONCLUSION:
+            variables["covered_topics"] = kwargs.get("agenda_items", "")
 
-        result = await chain.ainvoke({})
+        result = await chain.ainvoke(variables)
 
         if not isinstance(result, Slide):
             raise LLMValidationError(f"Expected Slide, got {type(result)}")
 
         # Ensure correct slide type
-        if result.type != slide_type:
-            result = Slide(
-                type=slide_type,
-                title=result.title,
-                content=result.content,
-                image=result.image,
-                question=result.question,
+        result = self._ensure_type(result, slide_type)
+
+        _response_cache.set(cache_key, _slide_adapter.dump_json(result))
+        return result
+
+    async def _generate_content_slides(
+        self,
+        request: LessonRequest,
+        subtopics: list[str],
+        question_slide_index: int,
+    ) -> list[Slide]:
+        """
+        Generate all content slides in a single LLM call.
+
+        Args:
+            request: Lesson request with topic, grade, context.
+            subtopics: Planned subtopics, one per content slide.
+            question_slide_index: Index of the content slide that gets the question.
+
+        Returns:
+            Content slides in subtopic order.
+
+        Raises:
+            LLMValidationError: If the number of slides doesn't match the subtopics.
+        """
+        cache_key = self._cache_key(
+            "content_slides",
+            request,
+            subtopics=subtopics,
+            question_slide_index=question_slide_index,
+        )
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _slides_adapter.validate_json(cached)
+
+        slide_plan = "\n".join(
+            f"{i + 1}. {subtopic}"
+            + (" (include image)" if i % 2 == 0 else "")
+            + (" (include question)" if i == question_slide_index else "")
+            for i, subtopic in enumerate(subtopics)
+        )
+
+        result = await self._content_slides_chain.ainvoke(
+            {
+                "topic": request.topic,
+                "grade": request.grade,
+                "context": request.context or "No specific context provided.",
+                "total_content_slides": len(subtopics),
+                "slide_plan": slide_plan,
+            }
+        )
+
+        if not isinstance(result, ContentSlides):
+            raise LLMValidationError(f"Expected ContentSlides, got {type(result)}")
+        if len(result.slides) != len(subtopics):
+            raise LLMValidationError(
+                f"Expected {len(subtopics)} content slides, got {len(result.slides)}"
             )
 
+        slides = [self._ensure_type(slide, SlideType.CONTENT) for slide in result.slides]
+        _response_cache.set(cache_key, _slides_adapter.dump_json(slides))
+        return slides
+
+    async def _generate_meta_slides(
+        self,
+        request: LessonRequest,
+        subtopics: list[str],
+        agenda_items: str,
+    ) -> MetaSlides:
+        """
+        Generate the title, agenda, and conclusion slides in a single LLM call.
+
+        Args:
+            request: Lesson request with topic, grade, context.
+            subtopics: Planned subtopics covered by the lesson.
+            agenda_items: Subtopics formatted as a bullet list.
+
+        Returns:
+            MetaSlides with each slide's type set accordingly.
+        """
+        cache_key = self._cache_key("meta_slides", request, subtopics=subtopics)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _meta_slides_adapter.validate_json(cached)
+
+        result = await self._meta_slides_chain.ainvoke(
+            {
+                "topic": request.topic,
+                "grade": request.grade,
+                "context": request.context or "No specific context provided.",
+                "n_slides": len(subtopics),
+                "agenda_items": agenda_items,
+            }
+        )
+
+        if not isinstance(result, MetaSlides):
+            raise LLMValidationError(f"Expected MetaSlides, got {type(result)}")
+
+        result = MetaSlides(
+            title=self._ensure_type(result.title, SlideType.TITLE),
+            agenda=self._ensure_type(result.agenda, SlideType.AGENDA),
+            conclusion=self._ensure_type(result.conclusion, SlideType.CONCLUSION),
+        )
+        _response_cache.set(cache_key, _meta_slides_adapter.dump_json(result))
         return result
 
     async def stream_presentation(self, request: LessonRequest) -> AsyncGenerator[Slide, None]:
         """
         Generate presentation slide by slide via streaming.
 
-        Each slide is generated individually and yielded as soon as it's ready,
-        providing true streaming behavior.
+        After the agenda is planned, all slides are generated concurrently (bounded
+        by LLM_MAX_CONCURRENCY) and yielded in presentation order as soon as each
+        one and all slides before it are ready. With LLM_BATCH_CONTENT_SLIDES, the
+        content slides come from a single LLM call instead of one call each; with
+        LLM_BATCH_META_SLIDES, so do the title, agenda, and conclusion slides.
 
         Args:
             request: Lesson request with topic, grade, context, and n_slides.
@@ -357,74 +596,131 @@ class LLMEngine:
             LLMValidationError: If output doesn't match schema.
         """
         logger.info(
-            f"Streaming presentation generation (provider: {self.provider}) "
-            f"for topic: {request.topic}, n_slides: {request.n_slides}"
+            "Streaming presentation generation (provider: %s) for topic: %s, n_slides: %d",
+            self.provider,
+            request.topic,
+            request.n_slides,
         )
 
         try:
             # Step 1: Plan the agenda/subtopics
             logger.debug("Planning agenda subtopics...")
             subtopics = await self._plan_agenda(request)
-            logger.debug(f"Planned subtopics: {subtopics}")
-
-            # Step 2: Generate title slide
-            logger.debug("Generating title slide...")
-            title_slide = await self._generate_single_slide(request, SlideType.TITLE)
-            yield title_slide
-            logger.debug("Title slide generated and yielded")
-
-            # Step 3: Generate agenda slide
-            logger.debug("Generating agenda slide...")
-            agenda_slide = await self._generate_single_slide(
-                request,
-                SlideType.AGENDA,
-                subtopics=subtopics,
-            )
-            yield agenda_slide
-            logger.debug("Agenda slide generated and yielded")
-
-            # Step 4: Generate content slides one by one
-            # Determine which slide gets the question (middle slide)
-            question_slide_index = request.n_slides // 2
-
-            for i, subtopic in enumerate(subtopics):
-                logger.debug(f"Generating content slide {i + 1}/{request.n_slides}...")
-
-                # Add image to some slides (every other slide)
-                include_image = i % 2 == 0
-
-                # Add question to the middle slide
-                include_question = i == question_slide_index
-
-                content_slide = await self._generate_single_slide(
-                    request,
-                    SlideType.CONTENT,
-                    slide_number=i + 1,
-                    total_content_slides=request.n_slides,
-                    subtopic=subtopic,
-                    include_image=include_image,
-                    include_question=include_question,
+            logger.debug("Planned subtopics: %s", subtopics)
+
+            # Formatted once and shared by the agenda and conclusion prompts
+            agenda_items = "\n".join(f"- {item}" for item in subtopics)
+
+            # Step 2: Start every slide concurrently. The semaphore bounds in-flight
+            # LLM calls, and tasks acquire it in creation order, so earlier slides
+            # are generated first.
+            semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+            # Determine which slide gets the question (middle slide). The agenda can
+            # plan fewer subtopics than requested, so count the planned ones.
+            question_slide_index = len(subtopics) // 2
+
+            async def generate_slide(slide_type: SlideType, **kwargs) -> Slide:
+                async with semaphore:
+                    return await self._generate_single_slide(request, slide_type, **kwargs)
+
+            async def generate_meta_slides() -> MetaSlides:
+                async with semaphore:
+                    return await self._generate_meta_slides(request, subtopics, agenda_items)
+
+            async def generate_content_slides() -> list[Slide]:
+                async with semaphore:
+                    return await self._generate_content_slides(
+                        request, subtopics, question_slide_index
+                    )
+
+            # Title and agenda (or the combined meta call) are created first, so they
+            # queue for the semaphore ahead of the content slides
+            if settings.LLM_BATCH_META_SLIDES:
+                meta_task = asyncio.create_task(generate_meta_slides())
+                helper_tasks = [meta_task]
+
+                async def meta_slide(field: str) -> Slide:
+                    return getattr(await meta_task, field)
+
+                title_task = asyncio.create_task(meta_slide("title"))
+                agenda_task = asyncio.create_task(meta_slide("agenda"))
+                conclusion_task = asyncio.create_task(meta_slide("conclusion"))
+            else:
+                helper_tasks = []
+                title_task = asyncio.create_task(generate_slide(SlideType.TITLE))
+                agenda_task = asyncio.create_task(
+                    generate_slide(SlideType.AGENDA, agenda_items=agenda_items)
                 )
-                yield content_slide
-                logger.debug(f"Content slide {i + 1} generated and yielded")
-
-            # Step 5: Generate conclusion slide
-            logger.debug("Generating conclusion slide...")
-            conclusion_slide = await self._generate_single_slide(
-                request,
-                SlideType.CONCLUSION,
-                subtopics=subtopics,
-            )
-            yield conclusion_slide
-            logger.debug("Conclusion slide generated and yielded")
 
-            logger.info(
-                f"Successfully streamed presentation with " f"{request.n_slides + 3} slides"
-            )
+            if settings.LLM_BATCH_CONTENT_SLIDES:
+                content_tasks = [asyncio.create_task(generate_content_slides())]
+            else:
+                content_tasks = [
+                    asyncio.create_task(
+                        generate_slide(
+                            SlideType.CONTENT,
+                            slide_number=i + 1,
+                            total_content_slides=len(subtopics),
+                            subtopic=subtopic,
+                            # Add image to some slides (every other slide)
+                            include_image=i % 2 == 0,
+                            # Add question to the middle slide
+                            include_question=i == question_slide_index,
+                        )
+                    )
+                    for i, subtopic in enumerate(subtopics)
+                ]
+
+            if not settings.LLM_BATCH_META_SLIDES:
+                conclusion_task = asyncio.create_task(
+                    generate_slide(SlideType.CONCLUSION, agenda_items=agenda_items)
+                )
+
+            tasks = [title_task, agenda_task, *content_tasks, conclusion_task]
+
+            # Like asyncio.TaskGroup (Python 3.11+): the first failed slide cancels
+            # the others instead of letting them run on until the stream reaches it
+            failures: list[BaseException] = []
+
+            def cancel_on_failure(done: asyncio.Task) -> None:
+                if failures or done.cancelled() or done.exception() is None:
+                    return
+                failures.append(done.exception())
+                for task in tasks:
+                    task.cancel()
+
+            for task in tasks:
+                task.add_done_callback(cancel_on_failure)
+
+            # Step 3: Yield slides in presentation order as each one completes
+            total_slides = len(subtopics) + 3
+            position = 0
+            try:
+                for task in tasks:
+                    # Unlike awaiting the task, asyncio.wait raises CancelledError only
+                    # when this stream itself is cancelled, so that is never mistaken
+                    # for a slide cancelled by cancel_on_failure
+                    await asyncio.wait((task,))
+                    if task.cancelled() and failures:
+                        # Surface the slide error that caused the cancellation
+                        raise failures[0]
+                    result = task.result()
+                    for slide in result if isinstance(result, list) else [result]:
+                        position += 1
+                        yield slide
+                        logger.debug("Slide %d/%d generated and yielded", position, total_slides)
+            finally:
+                # Stop pending generations if a slide failed or the client went away
+                for task in (*tasks, *helper_tasks):
+                    task.cancel()
+                await asyncio.gather(*tasks, *helper_tasks, return_exceptions=True)
+
+            logger.info("Successfully streamed presentation with %d slides", total_slides)
 
         except ValidationError as e:
-            logger.error(f"Pydantic validation error during streaming: {e}")
+            logger.error("Pydantic validation error during streaming: %s", e)
             raise LLMValidationError(f"Streamed content doesn't match Slide schema: {e}") from e
         except Exception as e:
-            logger.error(f"Error streaming presentation: {e}", exc_info=True)
+            logger.error("Error streaming presentation: %s", e, exc_info=True)
             raise LLMGenerationError(f"Failed to stream presentation: {str(e)}") from e
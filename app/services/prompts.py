@@ -1,145 +1,142 @@
-SYSTEM_PROMPT = """
-You are an expert educational content creator specializing in creating engaging and pedagogically sound lesson presentations.
-
-Your task is to generate a complete slide deck presentation based on the provided topic, student grade level, and context.
-
-CRITICAL REQUIREMENTS:
-
-1. STRUCTURE: You MUST generate exactly this structure:
-   - 1 Title slide (type: "title")
-   - 1 Agenda slide (type: "agenda")
-   - {n_slides} Content slides (type: "content")
-   - 1 Conclusion slide (type: "conclusion")
-
-   Total slides = {n_slides} + 3
-
-2. TITLE SLIDE:
-   - Must have an engaging title related to the topic
-   - Content should include the topic name prominently
-   - Keep it simple and clear
-
-3. AGENDA SLIDE:
-   - List the main points that will be covered in the content slides
-   - Should match the content slides you'll generate
-   - Format as bullet points
-
-4. CONTENT SLIDES:
-   - Each slide must have a clear, objective title
-   - Content should be appropriate for the grade level: {grade}
-   - Use bullet points, short paragraphs, or other clear structures
-   - Content should be educational and pedagogically sound
-   - Some slides may include an optional "image" field with a search query for relevant images
-   - ONE content slide (in the middle) may optionally include a "question" field with:
-     * prompt: A relevant learning question
-     * options: List of 2-5 answer options (typically 4)
-     * answer: The correct answer (must match one of the options)
-
-5. CONCLUSION SLIDE:
-   - Summarize key points from the lesson
-   - Reinforce learning objectives
-   - Keep it concise
-
-6. GRADE LEVEL ADAPTATION:
-   - Adjust language complexity, examples, and depth based on: {grade}
-   - Use age-appropriate vocabulary and concepts
-
-7. CONTEXT CONSIDERATION:
-   - Incorporate any specific context provided: {context}
-   - Focus on areas mentioned in the context
-
-IMPORTANT:
-- All content must be accurate and educational
-- Keep text concise and readable (slides should not be text-heavy)
-- Ensure the question (if included) is relevant to the content presented up to that point
-- Image search queries should be specific and relevant to the slide content
-- Follow the exact JSON structure specified in the Presentation schema
-"""
-
-USER_PROMPT_TEMPLATE = """
-Create a lesson presentation with the following details:
-
-Topic: {topic}
-Grade Level: {grade}
-Number of Content Slides: {n_slides}
-Additional Context: {context}
-
-Generate a complete presentation following the structure and requirements specified in the system prompt."""
-
-
 # --- Prompts for slide-by-slide streaming generation ---
 
+# Every prompt puts its static instructions first and the per-request values last,
+# so the provider can reuse its prompt cache for the shared prefix across requests.
 SLIDE_SYSTEM_PROMPT = """
-You are an expert educational content creator. Generate a SINGLE slide for a lesson presentation.
+You are an expert educational content creator. Generate the requested slides for a lesson presentation.
 
 REQUIREMENTS:
-- Grade level: {grade}
-- Language and complexity must be appropriate for this grade level
+- Language and complexity must be appropriate for the lesson's grade level
 - Content must be accurate, educational, and pedagogically sound
 - Keep text concise and readable (slides should not be text-heavy)
-- Additional context to consider: {context}
+- Take into account the additional context given for the lesson
+"""
+
+SLIDE_LESSON_PROMPT = """
+Lesson parameters:
+- Grade level: {grade}
+- Additional context: {context}
 """
 
 TITLE_SLIDE_PROMPT = """
-Generate a TITLE slide for a lesson about: {topic}
+Generate ONLY the TITLE slide of the lesson, with type "title".
 
 The title slide should:
 - Have an engaging, clear title related to the topic
 - Content should introduce the lesson topic prominently
 - Be simple and visually appealing
 
-Generate ONLY the title slide with type "title".
+Lesson topic: {topic}
 """
 
 AGENDA_SLIDE_PROMPT = """
-Generate an AGENDA slide for a lesson about: {topic}
+Generate ONLY the AGENDA slide of the lesson, with type "agenda".
 
-The agenda should list these {n_slides} main topics that will be covered:
+The agenda should list the main topics that will be covered, formatted as bullet points.
+
+Lesson topic: {topic}
+Main topics ({n_slides}):
 {agenda_items}
+"""
+
+_CONTENT_SLIDE_REQUIREMENTS = """
+Generate ONLY one CONTENT slide of the lesson, with type "content".
 
-Format the content as bullet points. Generate ONLY the agenda slide with type "agenda".
+Requirements:
+- Clear, objective title related to the subtopic
+- Content with bullet points or short paragraphs
+- Educational and appropriate for grade level
 """
 
-CONTENT_SLIDE_PROMPT = """
-Generate a CONTENT slide for a lesson about: {topic}
+_CONTENT_SLIDE_IMAGE_INSTRUCTION = """\
+- Include an "image" field with a relevant search query for an image
+"""
 
+_CONTENT_SLIDE_QUESTION_INSTRUCTION = """\
+- Include a "question" field with a multiple choice question (prompt, options array with 4 choices, and answer)
+"""
+
+_CONTENT_SLIDE_LESSON = """
+Lesson topic: {topic}
 This is slide {slide_number} of {total_content_slides} content slides.
 The specific subtopic for this slide is: {subtopic}
+"""
 
-Requirements:
-- Clear, objective title related to the subtopic
+# One content slide prompt per (include_image, include_question) combination,
+# with the optional instructions already in place
+CONTENT_SLIDE_PROMPTS = {
+    (include_image, include_question): _CONTENT_SLIDE_REQUIREMENTS
+    + (_CONTENT_SLIDE_IMAGE_INSTRUCTION if include_image else "")
+    + (_CONTENT_SLIDE_QUESTION_INSTRUCTION if include_question else "")
+    + _CONTENT_SLIDE_LESSON
+    for include_image in (False, True)
+    for include_question in (False, True)
+}
+
+CONTENT_SLIDES_PROMPT = """
+Generate ONLY the CONTENT slides of the lesson, each with type "content",
+exactly one slide per subtopic in the order given below.
+
+Requirements for every slide:
+- Clear, objective title related to its subtopic
 - Content with bullet points or short paragraphs
 - Educational and appropriate for grade level
-{image_instruction}
-{question_instruction}
+- Include an "image" field with a relevant search query for an image only where the plan says so
+- Include a "question" field with a multiple choice question (prompt, options array with 4 choices, and answer) only where the plan says so
 
-Generate ONLY this content slide with type "content".
+Lesson topic: {topic}
+Plan ({total_content_slides} slides):
+{slide_plan}
 """
 
 CONCLUSION_SLIDE_PROMPT = """
-Generate a CONCLUSION slide for a lesson about: {topic}
+Generate ONLY the CONCLUSION slide of the lesson, with type "conclusion".
 
+The conclusion should:
+- Summarize key points from the lesson
+- Reinforce learning objectives
+- Be concise and memorable
+
+Lesson topic: {topic}
 The lesson covered these main points:
 {covered_topics}
+"""
 
-The conclusion should:
+META_SLIDES_PROMPT = """
+Generate ONLY the TITLE, AGENDA, and CONCLUSION slides of the lesson.
+
+The title slide (type "title") should:
+- Have an engaging, clear title related to the topic
+- Content should introduce the lesson topic prominently
+- Be simple and visually appealing
+
+The agenda slide (type "agenda") should:
+- List the main topics of the lesson as bullet points
+
+The conclusion slide (type "conclusion") should:
 - Summarize key points from the lesson
 - Reinforce learning objectives
 - Be concise and memorable
 
-Generate ONLY the conclusion slide with type "conclusion".
+Lesson topic: {topic}
+Main topics ({n_slides}):
+{agenda_items}
 """
 
+AGENDA_SYSTEM_PROMPT = "You are an educational content planner."
+
 AGENDA_PLANNING_PROMPT = """
-You are planning a lesson about: {topic}
+Generate the subtopics/sections that should be covered in the lesson described below,
+one per content slide, in the order they should be taught. Each subtopic is a short title.
+
+Example subtopics for a 3-slide lesson about "Photosynthesis":
+"What is Photosynthesis?", "The Light-Dependent Reactions", "The Calvin Cycle"
+
+Lesson:
+Topic: {topic}
 Grade level: {grade}
 Number of content slides: {n_slides}
 Additional context: {context}
 
-Generate a list of {n_slides} subtopics/sections that should be covered in this lesson.
-Return ONLY a JSON array of strings, each being a subtopic title.
-
-Example output for a 3-slide lesson about "Photosynthesis":
-["What is Photosynthesis?", "The Light-Dependent Reactions", "The Calvin Cycle"]
-
-Generate the subtopics now:
+Generate the {n_slides} subtopics now:
 """
@@ -0,0 +1,261 @@
+"""
+Optional Redis-backed semantic cache for generated presentations and agendas.
+
+Near-duplicate lesson requests (e.g. "Intro to Photosynthesis" vs
+"Photosynthesis basics" for the same grade) are served from Redis by
+embedding similarity. Requires the `semantic-cache` extra (redisvl) and
+SEMANTIC_CACHE_REDIS_URL; otherwise the cache is disabled.
+
+Building the cache loads the embedding model and connects to Redis, so it is
+done once at startup by open_semantic_cache() rather than on a request.
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+
+from app.core.config import settings
+from app.schemas import Agenda, LessonRequest, Presentation
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticResponseCache:
+    """
+    Semantic cache of presentations and agendas keyed by an embedding of the request.
+
+    Entries are tagged with the request grade (and agendas with their slide
+    count) so a lookup only matches responses generated for the same grade.
+    Requests are embedded in a worker thread, since the sentence-transformers
+    model is synchronous and would otherwise block the event loop.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        distance_threshold: float = 0.1,
+        ttl: int | None = None,
+        vectorizer_model: str = "redis/langcache-embed-v1",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL.
+            distance_threshold: Maximum cosine distance for a hit.
+            ttl: Entry lifetime in seconds. If None, entries do not expire.
+            vectorizer_model: Hugging Face model used to embed requests.
+
+        Raises:
+            ImportError: If redisvl is not installed.
+        """
+        try:
+            from redisvl.extensions.llmcache import SemanticCache
+            from redisvl.utils.vectorize import HFTextVectorizer
+        except ImportError as e:
+            raise ImportError(
+                "Semantic caching requires redisvl; install the 'semantic-cache' extra"
+            ) from e
+
+        self._vectorizer = HFTextVectorizer(model=vectorizer_model)
+        self._cache = SemanticCache(
+            name="slides",
+            redis_url=redis_url,
+            distance_threshold=distance_threshold,
+            ttl=ttl,
+            vectorizer=self._vectorizer,
+            filterable_fields=[{"name": "grade", "type": "tag"}],
+        )
+        self._agenda_cache = SemanticCache(
+            name="agendas",
+            redis_url=redis_url,
+            distance_threshold=distance_threshold,
+            ttl=ttl,
+            vectorizer=self._vectorizer,
+            filterable_fields=[
+                {"name": "grade", "type": "tag"},
+                {"name": "n_slides", "type": "tag"},
+            ],
+        )
+
+    @staticmethod
+    def _prompt(request: LessonRequest) -> str:
+        """Build the text embedded for a request."""
+        return "\n".join(
+            (
+                request.topic,
+                request.grade,
+                request.context or "",
+                str(request.n_slides),
+            )
+        )
+
+    async def _embed(self, request: LessonRequest) -> list[float]:
+        """Embed a request off the event loop."""
+        return await asyncio.to_thread(self._vectorizer.embed, self._prompt(request))
+
+    async def aclose(self) -> None:
+        """Close the Redis connections of both caches."""
+        await self._cache.adisconnect()
+        await self._agenda_cache.adisconnect()
+
+    async def lookup_presentation(self, request: LessonRequest) -> Presentation | None:
+        """
+        Return a cached presentation for a semantically similar request.
+
+        The presentation's topic and grade are replaced with the request's own.
+        Lookup failures are logged and treated as a miss.
+
+        Args:
+            request: Lesson request with topic, grade, context, and n_slides.
+
+        Returns:
+            Cached Presentation, or None on a miss.
+        """
+        from redisvl.query.filter import Tag
+
+        try:
+            hits = await self._cache.acheck(
+                vector=await self._embed(request),
+                num_results=1,
+                filter_expression=Tag("grade") == request.grade,
+            )
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+
+        if not hits:
+            return None
+
+        try:
+            presentation = Presentation.model_validate_json(hits[0]["response"])
+        except Exception as e:
+            logger.warning("Discarding invalid semantic cache entry: %s", e)
+            return None
+
+        # Only reuse decks with the requested number of content slides
+        if len(presentation.slides) != request.n_slides + 3:
+            return None
+        # The hit was generated for another request; describe this one instead
+        return presentation.model_copy(update={"topic": request.topic, "grade": request.grade})
+
+    async def store_presentation(
+        self,
+        request: LessonRequest,
+        presentation: Presentation,
+    ) -> None:
+        """
+        Store a generated presentation. Failures are logged and ignored.
+
+        Args:
+            request: Lesson request the presentation was generated for.
+            presentation: Generated presentation.
+        """
+        try:
+            await self._cache.astore(
+                prompt=self._prompt(request),
+                vector=await self._embed(request),
+                response=presentation.model_dump_json(),
+                filters={"grade": request.grade},
+            )
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+
+    async def lookup_agenda(self, request: LessonRequest) -> list[str] | None:
+        """
+        Return cached subtopics for a semantically similar request.
+
+        Only agendas planned for the same grade and number of content slides
+        are considered. Lookup failures are logged and treated as a miss.
+
+        Args:
+            request: Lesson request with topic, grade, context, and n_slides.
+
+        Returns:
+            Cached subtopics, or None on a miss.
+        """
+        from redisvl.query.filter import Tag
+
+        try:
+            hits = await self._agenda_cache.acheck(
+                vector=await self._embed(request),
+                num_results=1,
+                filter_expression=(Tag("grade") == request.grade)
+                & (Tag("n_slides") == str(request.n_slides)),
+            )
+        except Exception as e:
+            logger.warning("Semantic agenda cache lookup failed: %s", e)
+            return None
+
+        if not hits:
+            return None
+
+        try:
+            return Agenda.model_validate_json(hits[0]["response"]).subtopics
+        except Exception as e:
+            logger.warning("Discarding invalid semantic agenda cache entry: %s", e)
+            return None
+
+    async def store_agenda(self, request: LessonRequest, subtopics: list[str]) -> None:
+        """
+        Store planned subtopics. Failures are logged and ignored.
+
+        Args:
+            request: Lesson request the agenda was planned for.
+            subtopics: Planned subtopics.
+        """
+        try:
+            await self._agenda_cache.astore(
+                prompt=self._prompt(request),
+                vector=await self._embed(request),
+                response=Agenda(subtopics=subtopics).model_dump_json(),
+                filters={"grade": request.grade, "n_slides": str(request.n_slides)},
+            )
+        except Exception as e:
+            logger.warning("Semantic agenda cache store failed: %s", e)
+
+
+@lru_cache(maxsize=1)
+def _build_semantic_cache() -> SemanticResponseCache | None:
+    """Build the shared semantic cache, or return None when it is not configured."""
+    if not settings.SEMANTIC_CACHE_REDIS_URL:
+        return None
+
+    try:
+        return SemanticResponseCache(
+            redis_url=settings.SEMANTIC_CACHE_REDIS_URL,
+            distance_threshold=settings.SEMANTIC_CACHE_DISTANCE_THRESHOLD,
+            ttl=settings.SEMANTIC_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning("Semantic cache disabled: %s", e)
+        return None
+
+
+def get_semantic_cache() -> SemanticResponseCache | None:
+    """
+    Get the shared semantic cache.
+
+    Never builds the cache itself, so a request never pays for loading the
+    embedding model or connecting to Redis.
+
+    Returns:
+        SemanticResponseCache instance, or None if disabled, unavailable, or
+        not opened yet.
+    """
+    if not _build_semantic_cache.cache_info().currsize:
+        return None
+    return _build_semantic_cache()
+
+
+async def open_semantic_cache() -> None:
+    """Build the shared semantic cache in a worker thread. Called on startup."""
+    await asyncio.to_thread(_build_semantic_cache)
+
+
+async def close_semantic_cache() -> None:
+    """Close the shared semantic cache's connections if it was built. Called on shutdown."""
+    cache = get_semantic_cache()
+    if cache is not None:
+        await cache.aclose()
+    _build_semantic_cache.cache_clear()
@@ -1,16 +1,26 @@
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.api.dependencies import get_llm_engine
 from app.main import app
-from app.schemas import Presentation, Question, Slide
+from app.schemas import LessonRequest, Presentation, Question, Slide
 from app.schemas.enums import SlideType
 from app.services import LLMEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop shared by every async test in the session."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
 def sample_request_data() -> dict:
     """Valid request data for slide generation."""
     return {
@@ -21,7 +31,7 @@ def sample_request_data() -> dict:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_request_minimal() -> dict:
     """Minimal valid request data (only required fields)."""
     return {
@@ -31,7 +41,19 @@ def sample_request_minimal() -> dict:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def math_request() -> LessonRequest:
+    """Small lesson request shared by engine tests."""
+    return LessonRequest(topic="Math", grade="5th grade", n_slides=2)
+
+
+@pytest.fixture(scope="session")
+def photosynthesis_request() -> LessonRequest:
+    """Lesson request matching sample_presentation."""
+    return LessonRequest(topic="Photosynthesis", grade="7th grade", n_slides=3)
+
+
+@pytest.fixture(scope="session")
 def sample_question() -> Question:
     """Sample question for testing."""
     return Question(
@@ -46,7 +68,7 @@ def sample_question() -> Question:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_slides(sample_question: Question) -> list[Slide]:
     """Sample slides following the required structure."""
     return [
@@ -85,7 +107,7 @@ def sample_slides(sample_question: Question) -> list[Slide]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_presentation(sample_slides: list[Slide]) -> Presentation:
     """Sample complete presentation."""
     return Presentation(
@@ -96,16 +118,57 @@ def sample_presentation(sample_slides: list[Slide]) -> Presentation:
 
 
 @pytest.fixture
-def mock_llm_engine(sample_presentation: Presentation) -> MagicMock:
-    """Mock LLMEngine that returns sample presentation."""
-    mock = MagicMock(spec=LLMEngine)
-    mock.generate_presentation = AsyncMock(return_value=sample_presentation)
+def redisvl_env():
+    """
+    Patch redisvl's SemanticCache and HFTextVectorizer with autospecs of the real classes.
 
-    async def mock_stream():
-        yield sample_presentation
+    Calls that don't match the installed redisvl API fail instead of passing
+    silently. Each SemanticCache built gets its own instance, keyed by name.
+    Tests using this fixture are skipped when redisvl is not installed.
+    """
+    llmcache = pytest.importorskip("redisvl.extensions.llmcache")
+    vectorize = pytest.importorskip("redisvl.utils.vectorize")
 
-    mock.stream_presentation = MagicMock(return_value=mock_stream())
-    return mock
+    real_cache_cls = llmcache.SemanticCache
+    caches = {}
+
+    def build_cache(**kwargs):
+        caches[kwargs["name"]] = create_autospec(real_cache_cls, instance=True)
+        return caches[kwargs["name"]]
+
+    with patch.object(llmcache, "SemanticCache", autospec=True) as cache_cls, patch.object(
+        vectorize, "HFTextVectorizer", autospec=True
+    ) as vectorizer_cls:
+        cache_cls.side_effect = build_cache
+        vectorizer_cls.return_value.embed.return_value = [0.1, 0.2, 0.3]
+        yield SimpleNamespace(cache_cls=cache_cls, vectorizer_cls=vectorizer_cls, caches=caches)
+
+
+class _FakeLLMEngine:
+    """Lightweight stand-in for LLMEngine that always returns one presentation."""
+
+    def __init__(self, presentation: Presentation):
+        self._presentation = presentation
+
+    async def generate_presentation(self, *_args, **_kwargs) -> Presentation:
+        return self._presentation
+
+    async def generate_presentations(self, requests: list, *_args, **_kwargs) -> list[Presentation]:
+        return [self._presentation] * len(requests)
+
+    async def stream_presentation(self, *_args, **_kwargs):
+        for slide in self._presentation.slides:
+            yield slide
+
+
+@pytest.fixture(scope="session")
+def mock_llm_engine(sample_presentation: Presentation) -> _FakeLLMEngine:
+    """
+    Fake LLMEngine that returns sample presentation.
+
+    Tests that assert on engine calls build their own MagicMock instead.
+    """
+    return _FakeLLMEngine(sample_presentation)
 
 
 @pytest.fixture
@@ -118,25 +181,28 @@ def mock_llm_engine_error() -> MagicMock:
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client() -> TestClient:
-    """Test client without mocks (for system endpoints)."""
+    """
+    Test client without mocks (for system endpoints).
+
+    The client holds no per-test state, so one instance is shared per module;
+    mocked variants below add their dependency overrides on top of it.
+    """
     return TestClient(app)
 
 
 @pytest.fixture
-def client_with_mock_llm(mock_llm_engine: MagicMock) -> TestClient:
+def client_with_mock_llm(client: TestClient, mock_llm_engine: _FakeLLMEngine) -> TestClient:
     """Test client with mocked LLM engine."""
     app.dependency_overrides[get_llm_engine] = lambda: mock_llm_engine
-    client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def client_with_error_llm(mock_llm_engine_error: MagicMock) -> TestClient:
+def client_with_error_llm(client: TestClient, mock_llm_engine_error: MagicMock) -> TestClient:
     """Test client with LLM engine that raises errors."""
     app.dependency_overrides[get_llm_engine] = lambda: mock_llm_engine_error
-    client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.api.dependencies import get_llm_engine
 from app.main import app
-from app.services import LLMValidationError
+from app.services import LLMGenerationError, LLMValidationError
 
 
 class TestGenerateSlides:
@@ -153,6 +153,7 @@ class TestGenerateSlides:
 
     def test_generate_slides_llm_validation_error(
         self,
+        client: TestClient,
         sample_request_data: dict,
     ):
         """Test that LLM validation errors return 422."""
@@ -162,7 +163,6 @@ class TestGenerateSlides:
         )
 
         app.dependency_overrides[get_llm_engine] = lambda: mock_engine
-        client = TestClient(app)
 
         response = client.post("/api/v1/slide", json=sample_request_data)
 
@@ -172,6 +172,81 @@ class TestGenerateSlides:
         app.dependency_overrides.clear()
 
 
+class TestBatchEndpoint:
+    """Tests for the /api/v1/slide/batch endpoint."""
+
+    def test_batch_returns_result_per_request(
+        self,
+        client_with_mock_llm: TestClient,
+        sample_request_data: dict,
+        sample_request_minimal: dict,
+    ):
+        """Test that each requested lesson gets a presentation, in order."""
+        response = client_with_mock_llm.post(
+            "/api/v1/slide/batch",
+            json={"requests": [sample_request_data, sample_request_minimal]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()["results"]
+        assert len(results) == 2
+        for result in results:
+            assert result["error"] is None
+            assert result["presentation"]["slides"][0]["type"] == "title"
+
+    def test_batch_reports_item_errors(
+        self,
+        client: TestClient,
+        sample_request_data: dict,
+        sample_presentation,
+    ):
+        """Test that a failed lesson is reported without failing the batch."""
+        mock_engine = MagicMock()
+        mock_engine.generate_presentations = AsyncMock(
+            return_value=[sample_presentation, LLMGenerationError("API Error")]
+        )
+
+        app.dependency_overrides[get_llm_engine] = lambda: mock_engine
+
+        response = client.post(
+            "/api/v1/slide/batch",
+            json={"requests": [sample_request_data, sample_request_data], "max_concurrency": 2},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        ok, failed = response.json()["results"]
+        assert ok["presentation"] is not None
+        assert failed["presentation"] is None
+        assert "AI generation failed" in failed["error"]
+        mock_engine.generate_presentations.assert_awaited_once()
+        assert mock_engine.generate_presentations.await_args.kwargs["max_concurrency"] == 2
+
+        app.dependency_overrides.clear()
+
+    def test_batch_empty_rejected(
+        self,
+        client_with_mock_llm: TestClient,
+    ):
+        """Test that an empty batch is rejected."""
+        response = client_with_mock_llm.post("/api/v1/slide/batch", json={"requests": []})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_batch_too_large_rejected(
+        self,
+        client_with_mock_llm: TestClient,
+        sample_request_data: dict,
+    ):
+        """Test that batches over 50 lessons are rejected."""
+        response = client_with_mock_llm.post(
+            "/api/v1/slide/batch",
+            json={"requests": [sample_request_data] * 51},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 class TestStreamingEndpoint:
     """Tests for the /api/v1/streaming endpoint."""
 
@@ -181,13 +256,13 @@ class TestStreamingEndpoint:
         sample_request_data: dict,
     ):
         """Test that streaming endpoint returns event stream."""
-        response = client_with_mock_llm.post(
+        with client_with_mock_llm.stream(
+            "POST",
             "/api/v1/streaming",
             json=sample_request_data,
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-        assert response.headers["content-type"] == "text/event-stream; charset=utf-8"
+        ) as response:
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"] == "text/event-stream; charset=utf-8"
 
     def test_streaming_returns_data(
         self,
@@ -195,16 +270,15 @@ class TestStreamingEndpoint:
         sample_request_data: dict,
     ):
         """Test that streaming returns valid data chunks."""
-        response = client_with_mock_llm.post(
+        with client_with_mock_llm.stream(
+            "POST",
             "/api/v1/streaming",
             json=sample_request_data,
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-        content = response.text
+        ) as response:
+            assert response.status_code == status.HTTP_200_OK
 
-        # Should contain SSE data
-        assert "data:" in content
+            # Should contain SSE data; stop reading at the first event
+            assert any(line.startswith("data:") for line in response.iter_lines())
 
     def test_streaming_ends_with_done(
         self,
@@ -212,6 +286,34 @@ class TestStreamingEndpoint:
         sample_request_data: dict,
     ):
         """Test that streaming ends with done event."""
+        with client_with_mock_llm.stream(
+            "POST",
+            "/api/v1/streaming",
+            json=sample_request_data,
+        ) as response:
+            assert response.status_code == status.HTTP_200_OK
+
+            # Keep only a short tail so a marker split across chunks is still found,
+            # and stop reading as soon as the done event arrives
+            buffer = ""
+            for chunk in response.iter_text(chunk_size=256):
+                buffer = buffer[-16:] + chunk
+                if "[DONE]" in buffer:
+                    break
+            response.close()
+
+        # Should end with done event
+        assert "[DONE]" in buffer
+
+    def test_streaming_buffered_mode(
+        self,
+        client_with_mock_llm: TestClient,
+        sample_request_data: dict,
+        monkeypatch,
+    ):
+        """Test that buffered streaming still delivers every slide and the done event."""
+        monkeypatch.setattr("app.api.v1.endpoints.settings.SSE_FLUSH_EACH_SLIDE", False)
+
         response = client_with_mock_llm.post(
             "/api/v1/streaming",
             json=sample_request_data,
@@ -220,8 +322,8 @@ class TestStreamingEndpoint:
         assert response.status_code == status.HTTP_200_OK
         content = response.text
 
-        # Should end with done event
-        assert "[DONE]" in content
+        assert content.count("data: {") == 6
+        assert content.endswith("event: done\ndata: [DONE]\n\n")
 
     def test_streaming_invalid_request(
         self,
@@ -245,13 +347,13 @@ class TestStreamingEndpoint:
         sample_request_data: dict,
     ):
         """Test that streaming response has correct headers."""
-        response = client_with_mock_llm.post(
+        with client_with_mock_llm.stream(
+            "POST",
             "/api/v1/streaming",
             json=sample_request_data,
-        )
-
-        assert response.headers.get("cache-control") == "no-cache"
-        assert response.headers.get("x-accel-buffering") == "no"
+        ) as response:
+            assert response.headers.get("cache-control") == "no-cache"
+            assert response.headers.get("x-accel-buffering") == "no"
 
 
 class TestEdgeCases:
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
@@ -58,6 +59,11 @@ class TestHealthEndpoint:
 class TestAPIDocumentation:
     """Tests for API documentation endpoints."""
 
+    @pytest.fixture(autouse=True, scope="class")
+    def warm_openapi_schema(self, client: TestClient) -> None:
+        """Build the OpenAPI schema once so each test only fetches the cached copy."""
+        client.get("/openapi.json")
+
     def test_openapi_schema_available(self, client: TestClient):
         """Test that OpenAPI schema is available."""
         response = client.get("/openapi.json")
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+from app.services.cache import ResponseCache, make_cache_key
+
+
+class TestResponseCache:
+    """Tests for the in-process response cache."""
+
+    def test_get_returns_stored_value(self):
+        """Test that a stored value is returned on a hit."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set("key", ["Numbers", "Shapes"])
+
+        assert cache.get("key") == ["Numbers", "Shapes"]
+
+    def test_get_missing_key_returns_none(self):
+        """Test that a miss returns None."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries older than ttl are dropped."""
+        cache = ResponseCache(maxsize=2, ttl=10)
+
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("key", 1)
+        with patch("app.services.cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+
+        assert len(cache) == 0
+
+    def test_zero_maxsize_disables_cache(self):
+        """Test that maxsize=0 never stores entries."""
+        cache = ResponseCache(maxsize=0, ttl=60)
+        cache.set("key", 1)
+
+        assert cache.get("key") is None
+
+
+class TestMakeCacheKey:
+    """Tests for cache key generation."""
+
+    def test_key_ignores_field_order(self):
+        """Test that field order does not change the key."""
+        assert make_cache_key(a=1, b={"x": 1, "y": 2}) == make_cache_key(b={"y": 2, "x": 1}, a=1)
+
+    def test_key_differs_for_different_values(self):
+        """Test that different inputs produce different keys."""
+        assert make_cache_key(topic="Math") != make_cache_key(topic="Science")
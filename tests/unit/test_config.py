@@ -1,77 +1,77 @@
-import os
+from unittest.mock import patch
 
 import pytest
-
-
-def create_test_settings(**env_vars):
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.core.config import Settings, get_settings
+
+
+class IsolatedSettings(BaseSettings):
+    """Settings class that does not load from .env file."""
+
+    model_config = SettingsConfigDict(
+        env_file=None,
+        extra="ignore",
+    )
+
+    OPENAI_API_KEY: str | None = None
+    GOOGLE_API_KEY: str | None = None
+    ENVIRONMENT: str = "development"
+    LOG_LEVEL: str = "INFO"
+    DEFAULT_LLM_PROVIDER: str = "google"
+    DEFAULT_MODEL: str = "gemini-2.0-flash"
+    DEFAULT_TEMPERATURE: float = 0.5
+    DEFAULT_MAX_RETRIES: int = 2
+    DEFAULT_TIMEOUT: int | None = None
+
+    def get_llm_provider(self) -> str:
+        """Get the LLM provider based on available keys."""
+        if self.OPENAI_API_KEY and self.GOOGLE_API_KEY:
+            return self.DEFAULT_LLM_PROVIDER
+        if self.GOOGLE_API_KEY:
+            return "google"
+        if self.OPENAI_API_KEY:
+            return "openai"
+        raise ValueError("No LLM API key configured. Set OPENAI_API_KEY or GOOGLE_API_KEY.")
+
+
+# Environment variables cleared before each settings instance is created
+MANAGED_KEYS = (
+    "OPENAI_API_KEY",
+    "GOOGLE_API_KEY",
+    "ENVIRONMENT",
+    "LOG_LEVEL",
+    "DEFAULT_LLM_PROVIDER",
+    "DEFAULT_MODEL",
+    "DEFAULT_TEMPERATURE",
+    "DEFAULT_MAX_RETRIES",
+    "DEFAULT_TIMEOUT",
+)
+
+
+def create_test_settings(monkeypatch: pytest.MonkeyPatch, **env_vars) -> IsolatedSettings:
     """
     Create a Settings instance with specific environment variables.
 
-    This helper temporarily sets environment variables, creates a Settings
-    instance that ignores the .env file, and then restores the original env.
+    Managed variables are cleared and the given ones set through monkeypatch,
+    which restores the original environment after the test. The instance
+    ignores the .env file.
     """
-    from pydantic_settings import BaseSettings, SettingsConfigDict
+    for key in MANAGED_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env_vars.items():
+        monkeypatch.setenv(key, str(value))
 
-    # Define a test-only Settings class that ignores .env file
-    class IsolatedSettings(BaseSettings):
-        """Settings class that does not load from .env file."""
+    return IsolatedSettings()
 
-        model_config = SettingsConfigDict(
-            env_file=None,
-            extra="ignore",
-        )
 
-        OPENAI_API_KEY: str | None = None
-        GOOGLE_API_KEY: str | None = None
-        ENVIRONMENT: str = "development"
-        LOG_LEVEL: str = "INFO"
-        DEFAULT_LLM_PROVIDER: str = "google"
-        DEFAULT_MODEL: str = "gemini-2.0-flash"
-        DEFAULT_TEMPERATURE: float = 0.5
-        DEFAULT_MAX_RETRIES: int = 2
-        DEFAULT_TIMEOUT: int | None = None
-
-        def get_llm_provider(self) -> str:
-            """Get the LLM provider based on available keys."""
-            if self.OPENAI_API_KEY and self.GOOGLE_API_KEY:
-                return self.DEFAULT_LLM_PROVIDER
-            if self.GOOGLE_API_KEY:
-                return "google"
-            if self.OPENAI_API_KEY:
-                return "openai"
-            raise ValueError("No LLM API key configured. Set OPENAI_API_KEY or GOOGLE_API_KEY.")
-
-    # Keys to manage
-    managed_keys = [
-        "OPENAI_API_KEY",
-        "GOOGLE_API_KEY",
-        "ENVIRONMENT",
-        "LOG_LEVEL",
-        "DEFAULT_LLM_PROVIDER",
-        "DEFAULT_MODEL",
-        "DEFAULT_TEMPERATURE",
-        "DEFAULT_MAX_RETRIES",
-        "DEFAULT_TIMEOUT",
-    ]
-
-    # Save and clear current environment
-    saved_env = {}
-    for key in managed_keys:
-        saved_env[key] = os.environ.pop(key, None)
-
-    # Set test environment variables
-    for key, value in env_vars.items():
-        os.environ[key] = str(value)
+def build_defaults() -> IsolatedSettings:
+    """
+    Create a Settings instance holding only the declared defaults.
 
-    try:
-        return IsolatedSettings()
-    finally:
-        # Restore original environment
-        for key in managed_keys:
-            os.environ.pop(key, None)
-        for key, value in saved_env.items():
-            if value is not None:
-                os.environ[key] = value
+    Skips environment parsing and validation, for tests that only read defaults.
+    """
+    return IsolatedSettings.model_construct()
 
 
 class TestSettings:
@@ -79,80 +79,152 @@ class TestSettings:
 
     def test_default_environment(self):
         """Test default environment is development."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.ENVIRONMENT == "development"
 
     def test_default_log_level(self):
         """Test default log level is INFO."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.LOG_LEVEL == "INFO"
 
     def test_default_temperature(self):
         """Test default temperature is 0.5."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.DEFAULT_TEMPERATURE == 0.5
 
     def test_default_max_retries(self):
         """Test default max retries is 2."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.DEFAULT_MAX_RETRIES == 2
 
     def test_api_keys_optional(self):
         """Test that API keys are optional (None by default)."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.OPENAI_API_KEY is None
         assert settings.GOOGLE_API_KEY is None
 
-    def test_environment_from_env_var(self):
+    def test_environment_from_env_var(self, monkeypatch: pytest.MonkeyPatch):
         """Test environment is set from env var."""
-        settings = create_test_settings(ENVIRONMENT="production")
+        settings = create_test_settings(monkeypatch, ENVIRONMENT="production")
         assert settings.ENVIRONMENT == "production"
 
-    def test_log_level_from_env_var(self):
+    def test_log_level_from_env_var(self, monkeypatch: pytest.MonkeyPatch):
         """Test log level is set from env var."""
-        settings = create_test_settings(LOG_LEVEL="DEBUG")
+        settings = create_test_settings(monkeypatch, LOG_LEVEL="DEBUG")
         assert settings.LOG_LEVEL == "DEBUG"
 
 
 class TestLLMProviderSelection:
     """Tests for LLM provider selection logic."""
 
-    def test_get_llm_provider_returns_default_when_both_keys(self):
-        """Test that get_llm_provider returns default when both keys are set."""
-        settings = create_test_settings(
-            DEFAULT_LLM_PROVIDER="openai",
-            GOOGLE_API_KEY="google-key",
-            OPENAI_API_KEY="openai-key",
-        )
-        assert settings.get_llm_provider() == "openai"
+    @pytest.mark.parametrize(
+        "env_vars,expected",
+        [
+            (
+                {
+                    "DEFAULT_LLM_PROVIDER": "openai",
+                    "GOOGLE_API_KEY": "google-key",
+                    "OPENAI_API_KEY": "openai-key",
+                },
+                "openai",
+            ),
+            (
+                {
+                    "DEFAULT_LLM_PROVIDER": "google",
+                    "GOOGLE_API_KEY": "google-key",
+                    "OPENAI_API_KEY": "openai-key",
+                },
+                "google",
+            ),
+            ({"OPENAI_API_KEY": "test-key"}, "openai"),
+            ({"GOOGLE_API_KEY": "test-key"}, "google"),
+        ],
+        ids=["both-keys-openai-default", "both-keys-google-default", "only-openai", "only-google"],
+    )
+    def test_get_llm_provider(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        env_vars: dict,
+        expected: str,
+    ):
+        """Test that the default provider is used with both keys, else the configured one."""
+        settings = create_test_settings(monkeypatch, **env_vars)
+        assert settings.get_llm_provider() == expected
+
+    def test_get_llm_provider_raises_when_no_keys(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that ValueError is raised when no keys configured."""
+        settings = create_test_settings(monkeypatch)
 
-    def test_get_llm_provider_returns_google_default(self):
-        """Test that Google is default when both keys available."""
-        settings = create_test_settings(
-            DEFAULT_LLM_PROVIDER="google",
-            GOOGLE_API_KEY="google-key",
-            OPENAI_API_KEY="openai-key",
-        )
-        assert settings.get_llm_provider() == "google"
+        with pytest.raises(ValueError) as exc_info:
+            settings.get_llm_provider()
 
-    def test_get_llm_provider_falls_back_to_openai(self):
-        """Test fallback to OpenAI when only OpenAI key available."""
-        settings = create_test_settings(OPENAI_API_KEY="test-key")
-        assert settings.get_llm_provider() == "openai"
+        assert "api key" in str(exc_info.value).lower()
+
+
+def create_app_settings(monkeypatch: pytest.MonkeyPatch, **env_vars) -> Settings:
+    """
+    Create the application Settings with specific environment variables.
+
+    Same environment handling as create_test_settings, but builds the real class
+    so its provider resolution is exercised. The .env file is skipped.
+    """
+    for key in MANAGED_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env_vars.items():
+        monkeypatch.setenv(key, str(value))
+
+    return Settings(_env_file=None)
+
+
+class TestAppSettingsProvider:
+    """Tests for provider resolution on the application Settings."""
+
+    def test_provider_resolved_once_at_construction(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the provider is resolved when settings load, not on every lookup."""
+        with patch.object(
+            Settings, "_resolve_llm_provider", autospec=True, return_value="google"
+        ) as resolve:
+            settings = create_app_settings(monkeypatch, GOOGLE_API_KEY="google-key")
+            resolve.assert_called_once_with(settings)
+
+            assert settings.get_llm_provider() == "google"
+            assert settings.get_llm_provider() == "google"
+
+        resolve.assert_called_once()
+
+    def test_provider_not_recomputed_after_construction(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that changing the keys after load does not change the provider."""
+        settings = create_app_settings(monkeypatch, GOOGLE_API_KEY="google-key")
+
+        settings.GOOGLE_API_KEY = None
 
-    def test_get_llm_provider_falls_back_to_google(self):
-        """Test fallback to Google when only Google key available."""
-        settings = create_test_settings(GOOGLE_API_KEY="test-key")
         assert settings.get_llm_provider() == "google"
 
-    def test_get_llm_provider_raises_when_no_keys(self):
-        """Test that ValueError is raised when no keys configured."""
-        settings = create_test_settings()
+    @pytest.mark.parametrize("default_provider", ["openai", "google"])
+    def test_default_provider_wins_with_both_keys(
+        self, monkeypatch: pytest.MonkeyPatch, default_provider: str
+    ):
+        """Test that DEFAULT_LLM_PROVIDER picks the provider when both keys are set."""
+        settings = create_app_settings(
+            monkeypatch,
+            DEFAULT_LLM_PROVIDER=default_provider,
+            GOOGLE_API_KEY="google-key",
+            OPENAI_API_KEY="openai-key",
+        )
+        assert settings.get_llm_provider() == default_provider
+
+    def test_raises_when_no_keys(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that ValueError is raised when no key is configured."""
+        settings = create_app_settings(monkeypatch)
 
         with pytest.raises(ValueError) as exc_info:
             settings.get_llm_provider()
 
-        assert "api key" in str(exc_info.value).lower()
+        assert "openai_api_key" in str(exc_info.value).lower()
+
+    def test_get_settings_returns_cached_instance(self):
+        """Test that the .env file is loaded once and the instance is shared."""
+        assert get_settings() is get_settings()
 
 
 class TestTimeoutParsing:
@@ -160,20 +232,20 @@ class TestTimeoutParsing:
 
     def test_timeout_none_by_default(self):
         """Test that timeout is None by default."""
-        settings = create_test_settings()
+        settings = build_defaults()
         assert settings.DEFAULT_TIMEOUT is None
 
-    def test_timeout_from_env_var(self):
+    def test_timeout_from_env_var(self, monkeypatch: pytest.MonkeyPatch):
         """Test that timeout is parsed from env var."""
-        settings = create_test_settings(DEFAULT_TIMEOUT="30")
+        settings = create_test_settings(monkeypatch, DEFAULT_TIMEOUT="30")
         assert settings.DEFAULT_TIMEOUT == 30
 
-    def test_temperature_from_env_var(self):
+    def test_temperature_from_env_var(self, monkeypatch: pytest.MonkeyPatch):
         """Test that temperature is parsed from env var."""
-        settings = create_test_settings(DEFAULT_TEMPERATURE="0.8")
+        settings = create_test_settings(monkeypatch, DEFAULT_TEMPERATURE="0.8")
         assert settings.DEFAULT_TEMPERATURE == 0.8
 
-    def test_max_retries_from_env_var(self):
+    def test_max_retries_from_env_var(self, monkeypatch: pytest.MonkeyPatch):
         """Test that max retries is parsed from env var."""
-        settings = create_test_settings(DEFAULT_MAX_RETRIES="5")
+        settings = create_test_settings(monkeypatch, DEFAULT_MAX_RETRIES="5")
         assert settings.DEFAULT_MAX_RETRIES == 5
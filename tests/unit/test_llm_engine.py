@@ -1,14 +1,95 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
-
-from app.schemas import LessonRequest, Presentation
+from pydantic import ValidationError
+
+import app.services.llm_engine as llm_engine_module
+from app.schemas import (
+    Agenda,
+    ContentSlides,
+    LessonRequest,
+    MetaSlides,
+    Presentation,
+    Question,
+    Slide,
+)
+from app.schemas.enums import SlideType
+from app.services.cache import ResponseCache
 from app.services.llm_engine import (
     LLMEngine,
     LLMEngineError,
     LLMGenerationError,
     LLMValidationError,
 )
+from app.services.semantic_cache import SemanticResponseCache
+
+
+@pytest.fixture(scope="module")
+def _patched_llm_env():
+    """Patch the engine's settings and provider classes once for the whole module."""
+    with patch.object(llm_engine_module, "settings") as mock_settings, patch.object(
+        llm_engine_module, "ChatGoogleGenerativeAI"
+    ) as mock_gemini, patch.object(llm_engine_module, "ChatOpenAI") as mock_openai:
+        yield SimpleNamespace(settings=mock_settings, gemini=mock_gemini, openai=mock_openai)
+
+
+@pytest.fixture
+def llm_env(_patched_llm_env: SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """
+    Patched settings and provider classes, reset to defaults before each test.
+
+    Each test also gets an empty response cache. Tests override only the
+    settings they care about.
+    """
+    monkeypatch.setattr(llm_engine_module, "_response_cache", ResponseCache(maxsize=8, ttl=60))
+
+    env = _patched_llm_env
+    for mock in (env.settings, env.gemini, env.openai):
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    env.settings.get_llm_provider.return_value = "google"
+    env.settings.GOOGLE_API_KEY = "test-key"
+    env.settings.OPENAI_API_KEY = "test-key"
+    env.settings.DEFAULT_MODEL = "gemini-2.0-flash"
+    env.settings.FALLBACK_MODEL = "gpt-4"
+    env.settings.DEFAULT_TEMPERATURE = 0.5
+    env.settings.DEFAULT_TIMEOUT = None
+    env.settings.DEFAULT_MAX_RETRIES = 2
+    env.settings.LLM_MAX_CONCURRENCY = 5
+    env.settings.LLM_BATCH_CONTENT_SLIDES = False
+    env.settings.LLM_BATCH_META_SLIDES = False
+    env.settings.SEMANTIC_CACHE_AGENDAS = False
+    return env
+
+
+async def _plan_numbers_and_shapes(_request: LessonRequest) -> list[str]:
+    """Agenda planner stub for tests that don't assert on planning."""
+    return ["Numbers", "Shapes"]
+
+
+@pytest.fixture
+def make_engine(llm_env: SimpleNamespace):
+    """
+    Factory for engines built against the patched environment.
+
+    If chain is given, every prompt chain of the engine is replaced by it.
+    """
+
+    def factory(provider: str = "google", chain=None, **attributes) -> LLMEngine:
+        engine = LLMEngine(provider=provider)
+        if chain is not None:
+            engine._agenda_chain = chain
+            engine._slide_chains = dict.fromkeys(engine._slide_chains, chain)
+            engine._content_slide_chains = dict.fromkeys(engine._content_slide_chains, chain)
+            engine._content_slides_chain = chain
+            engine._meta_slides_chain = chain
+        for name, value in attributes.items():
+            setattr(engine, name, value)
+        return engine
+
+    return factory
 
 
 class TestExceptions:
@@ -35,331 +116,759 @@ class TestExceptions:
 class TestLLMEngineInit:
     """Tests for LLMEngine initialization."""
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatGoogleGenerativeAI")
-    def test_init_with_google_provider(self, mock_gemini, mock_settings):
+    def test_init_with_google_provider(self, llm_env: SimpleNamespace):
         """Test initialization with Google provider."""
-        mock_settings.get_llm_provider.return_value = "google"
-        mock_settings.GOOGLE_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
-
         engine = LLMEngine(provider="google")
 
         assert engine.provider == "google"
-        assert engine.model == "gemini-2.0-flash"
-        mock_gemini.assert_called_once()
+        llm_env.gemini.assert_called_once()
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatOpenAI")
-    def test_init_with_openai_provider(self, mock_openai, mock_settings):
+    def test_init_with_openai_provider(self, llm_env: SimpleNamespace):
         """Test initialization with OpenAI provider."""
-        mock_settings.get_llm_provider.return_value = "openai"
-        mock_settings.OPENAI_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
+        llm_env.settings.get_llm_provider.return_value = "openai"
 
         engine = LLMEngine(provider="openai")
 
         assert engine.provider == "openai"
-        assert engine.model == "gpt-4"
-        mock_openai.assert_called_once()
+        llm_env.openai.assert_called_once()
 
-    @patch("app.services.llm_engine.settings")
-    def test_init_with_unsupported_provider(self, mock_settings):
+    def test_init_with_unsupported_provider(self, llm_env: SimpleNamespace):
         """Test initialization with unsupported provider raises error."""
-        mock_settings.get_llm_provider.return_value = "unsupported"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
+        llm_env.settings.get_llm_provider.return_value = "unsupported"
 
         with pytest.raises(ValueError) as exc_info:
             LLMEngine(provider="unsupported")
 
         assert "unsupported" in str(exc_info.value).lower()
 
-    @patch("app.services.llm_engine.settings")
-    def test_init_without_api_key_raises_error(self, mock_settings):
+    def test_init_without_api_key_raises_error(self, llm_env: SimpleNamespace):
         """Test initialization without API key raises error."""
-        mock_settings.get_llm_provider.return_value = "google"
-        mock_settings.GOOGLE_API_KEY = None
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
+        llm_env.settings.GOOGLE_API_KEY = None
 
         with pytest.raises(ValueError) as exc_info:
             LLMEngine(provider="google")
 
         assert "api_key" in str(exc_info.value).lower()
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatGoogleGenerativeAI")
-    def test_init_with_custom_temperature(self, mock_gemini, mock_settings):
-        """Test initialization with custom temperature."""
-        mock_settings.get_llm_provider.return_value = "google"
-        mock_settings.GOOGLE_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
+    @pytest.mark.parametrize(
+        "kwargs,attr,expected",
+        [
+            ({"provider": "google"}, "model", "gemini-2.0-flash"),
+            ({"provider": "openai"}, "model", "gpt-4"),
+            ({"provider": "google", "model": "gemini-pro"}, "model", "gemini-pro"),
+            ({"provider": "google", "temperature": 0.8}, "temperature", 0.8),
+        ],
+        ids=["google-default-model", "openai-default-model", "custom-model", "custom-temperature"],
+    )
+    def test_init_sets_model_and_temperature(
+        self,
+        llm_env: SimpleNamespace,
+        kwargs: dict,
+        attr: str,
+        expected,
+    ):
+        """Test default and custom model and temperature selection."""
+        llm_env.settings.get_llm_provider.return_value = kwargs["provider"]
 
-        engine = LLMEngine(provider="google", temperature=0.8)
+        engine = LLMEngine(**kwargs)
 
-        assert engine.temperature == 0.8
+        assert getattr(engine, attr) == expected
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatGoogleGenerativeAI")
-    def test_init_with_custom_model(self, mock_gemini, mock_settings):
-        """Test initialization with custom model."""
-        mock_settings.get_llm_provider.return_value = "google"
-        mock_settings.GOOGLE_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
+    def test_init_builds_slide_chains_once(self, llm_env: SimpleNamespace):
+        """Test that the structured-output LLM is built once for all slide types."""
+        engine = LLMEngine(provider="google")
 
-        engine = LLMEngine(provider="google", model="gemini-pro")
+        assert set(engine._slide_chains) == set(SlideType) - {SlideType.CONTENT}
+        assert set(engine._content_slide_chains) == {
+            (False, False),
+            (False, True),
+            (True, False),
+            (True, True),
+        }
+        structured_calls = llm_env.gemini.return_value.with_structured_output.call_args_list
+        assert structured_calls.count(call(Slide)) == 1
 
-        assert engine.model == "gemini-pro"
+    @pytest.mark.asyncio
+    async def test_openai_client_shares_http_pool(self, llm_env: SimpleNamespace):
+        """Test that the OpenAI client uses the engine's pooled HTTP client."""
+        llm_env.settings.get_llm_provider.return_value = "openai"
 
+        engine = LLMEngine(provider="openai")
+        http_client = engine._http_client
+
+        assert llm_env.openai.call_args.kwargs["http_async_client"] is http_client
+
+        await engine.aclose()
 
-class TestDefaultModel:
-    """Tests for default model selection."""
+        assert http_client.is_closed
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatGoogleGenerativeAI")
-    def test_google_default_model(self, mock_gemini, mock_settings):
-        """Test default model for Google provider."""
-        mock_settings.get_llm_provider.return_value = "google"
-        mock_settings.GOOGLE_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
+
+class TestWarmup:
+    """Tests for connection warmup."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_sends_one_token_request(self, llm_env: SimpleNamespace):
+        """Test that warmup sends a request limited to a single output token."""
+        llm_env.gemini.return_value.ainvoke = AsyncMock()
 
         engine = LLMEngine(provider="google")
+        await engine.warmup()
 
-        assert engine.model == "gemini-2.0-flash"
+        llm_env.gemini.return_value.ainvoke.assert_awaited_once_with(
+            "ping", generation_config={"max_output_tokens": 1}
+        )
 
-    @patch("app.services.llm_engine.settings")
-    @patch("app.services.llm_engine.ChatOpenAI")
-    def test_openai_default_model(self, mock_openai, mock_settings):
-        """Test default model for OpenAI provider."""
-        mock_settings.get_llm_provider.return_value = "openai"
-        mock_settings.OPENAI_API_KEY = "test-key"
-        mock_settings.DEFAULT_TEMPERATURE = 0.5
-        mock_settings.DEFAULT_TIMEOUT = None
-        mock_settings.DEFAULT_MAX_RETRIES = 2
+    @pytest.mark.asyncio
+    async def test_warmup_ignores_errors(self, llm_env: SimpleNamespace):
+        """Test that a failed warmup does not raise."""
 
-        engine = LLMEngine(provider="openai")
+        async def failing_ainvoke(*_args, **_kwargs):
+            raise Exception("Network error")
 
-        assert engine.model == "gpt-4"
+        llm_env.gemini.return_value.ainvoke = failing_ainvoke
 
+        engine = LLMEngine(provider="google")
 
-class TestGeneratePresentation:
-    """Tests for presentation generation."""
+        await engine.warmup()
 
-    @pytest.fixture
-    def mock_engine(self, sample_presentation: Presentation):
-        """Create a mocked LLMEngine."""
-        with patch("app.services.llm_engine.settings") as mock_settings, patch(
-            "app.services.llm_engine.ChatGoogleGenerativeAI"
-        ) as mock_gemini:
-            mock_settings.get_llm_provider.return_value = "google"
-            mock_settings.GOOGLE_API_KEY = "test-key"
-            mock_settings.DEFAULT_TEMPERATURE = 0.5
-            mock_settings.DEFAULT_TIMEOUT = None
-            mock_settings.DEFAULT_MAX_RETRIES = 2
 
-            # Mock the LLM chain
-            mock_chain = MagicMock()
-            mock_chain.ainvoke = AsyncMock(return_value=sample_presentation)
+class TestGeneratePresentation:
+    """Tests for presentation generation."""
 
-            mock_llm_instance = MagicMock()
-            mock_llm_instance.with_structured_output.return_value = mock_llm_instance
-            mock_llm_instance.__or__ = MagicMock(return_value=mock_chain)
+    @pytest.fixture(scope="class")
+    def shared_engine(
+        self,
+        _patched_llm_env: SimpleNamespace,
+        sample_presentation: Presentation,
+    ) -> LLMEngine:
+        """Engine built once for the class, whose stream yields the sample slides."""
+        _patched_llm_env.settings.GOOGLE_API_KEY = "test-key"
 
-            mock_gemini.return_value = mock_llm_instance
+        async def mock_stream(_):
+            for slide in sample_presentation.slides:
+                yield slide
 
-            engine = LLMEngine(provider="google")
-            engine._build_chain = MagicMock(return_value=mock_chain)
+        engine = LLMEngine(provider="google")
+        engine.stream_presentation = MagicMock(side_effect=mock_stream)
+        return engine
 
-            yield engine
+    @pytest.fixture
+    def mock_engine(self, shared_engine: LLMEngine):
+        """Shared engine with its stream stub cleared, and restored if a test replaces it."""
+        stream = shared_engine.stream_presentation
+        stream.reset_mock()
+        yield shared_engine
+        shared_engine.stream_presentation = stream
 
     @pytest.mark.asyncio
     async def test_generate_presentation_success(
         self,
+        photosynthesis_request: LessonRequest,
         mock_engine: LLMEngine,
         sample_presentation: Presentation,
     ):
         """Test successful presentation generation."""
-        request = LessonRequest(
-            topic="Photosynthesis",
-            grade="7th grade",
-            n_slides=3,
-        )
-
-        result = await mock_engine.generate_presentation(request)
+        result = await mock_engine.generate_presentation(photosynthesis_request)
 
         assert isinstance(result, Presentation)
-        assert result.topic == sample_presentation.topic
+        assert result.topic == photosynthesis_request.topic
+        assert result.slides == sample_presentation.slides
 
     @pytest.mark.asyncio
-    async def test_generate_presentation_calls_build_chain(
+    async def test_generate_presentation_consumes_stream(
         self,
+        math_request: LessonRequest,
         mock_engine: LLMEngine,
     ):
-        """Test that generate_presentation calls _build_chain."""
-        request = LessonRequest(
-            topic="Math",
-            grade="5th grade",
-            n_slides=2,
-        )
+        """Test that generate_presentation is assembled from stream_presentation."""
+        await mock_engine.generate_presentation(math_request)
+
+        mock_engine.stream_presentation.assert_called_once_with(math_request)
+
+    @pytest.mark.asyncio
+    async def test_generate_presentation_invalid_structure(
+        self,
+        math_request: LessonRequest,
+        mock_engine: LLMEngine,
+        sample_presentation: Presentation,
+    ):
+        """Test that an invalid slide sequence raises LLMValidationError."""
+
+        async def mock_stream(_):
+            for slide in sample_presentation.slides[1:]:
+                yield slide
+
+        mock_engine.stream_presentation = mock_stream
 
-        await mock_engine.generate_presentation(request)
+        with pytest.raises(LLMValidationError) as exc_info:
+            await mock_engine.generate_presentation(math_request)
 
-        mock_engine._build_chain.assert_called_once_with(request)
+        assert "schema" in str(exc_info.value).lower()
 
     @pytest.mark.asyncio
-    async def test_generate_presentation_invalid_result_type(self):
-        """Test that invalid result type raises LLMGenerationError with validation message."""
-        with patch("app.services.llm_engine.settings") as mock_settings, patch(
-            "app.services.llm_engine.ChatGoogleGenerativeAI"
-        ) as mock_gemini:
-            mock_settings.get_llm_provider.return_value = "google"
-            mock_settings.GOOGLE_API_KEY = "test-key"
-            mock_settings.DEFAULT_TEMPERATURE = 0.5
-            mock_settings.DEFAULT_TIMEOUT = None
-            mock_settings.DEFAULT_MAX_RETRIES = 2
-
-            # Mock chain to return wrong type
-            mock_chain = MagicMock()
-            mock_chain.ainvoke = AsyncMock(return_value={"wrong": "type"})
-
-            mock_llm_instance = MagicMock()
-            mock_gemini.return_value = mock_llm_instance
-
-            engine = LLMEngine(provider="google")
-            engine._build_chain = MagicMock(return_value=mock_chain)
-
-            request = LessonRequest(
-                topic="Math",
-                grade="5th grade",
-                n_slides=2,
-            )
+    async def test_generate_presentation_llm_error(
+        self,
+        math_request: LessonRequest,
+        mock_engine: LLMEngine,
+    ):
+        """Test that streaming errors propagate as LLMGenerationError."""
+
+        async def mock_stream(_):
+            raise LLMGenerationError("Failed to stream presentation: API Error")
+            yield  # Make it a generator
+
+        mock_engine.stream_presentation = mock_stream
 
-            with pytest.raises(LLMGenerationError) as exc_info:
-                await engine.generate_presentation(request)
+        with pytest.raises(LLMGenerationError) as exc_info:
+            await mock_engine.generate_presentation(math_request)
 
-            assert "unexpected type" in str(exc_info.value).lower()
+        assert "api error" in str(exc_info.value).lower()
 
     @pytest.mark.asyncio
-    async def test_generate_presentation_llm_error(self):
-        """Test that LLM errors are wrapped in LLMGenerationError."""
-        with patch("app.services.llm_engine.settings") as mock_settings, patch(
-            "app.services.llm_engine.ChatGoogleGenerativeAI"
-        ) as mock_gemini:
-            mock_settings.get_llm_provider.return_value = "google"
-            mock_settings.GOOGLE_API_KEY = "test-key"
-            mock_settings.DEFAULT_TEMPERATURE = 0.5
-            mock_settings.DEFAULT_TIMEOUT = None
-            mock_settings.DEFAULT_MAX_RETRIES = 2
-
-            # Mock chain to raise error
-            mock_chain = MagicMock()
-            mock_chain.ainvoke = AsyncMock(side_effect=Exception("API Error"))
-
-            mock_llm_instance = MagicMock()
-            mock_gemini.return_value = mock_llm_instance
-
-            engine = LLMEngine(provider="google")
-            engine._build_chain = MagicMock(return_value=mock_chain)
-
-            request = LessonRequest(
-                topic="Math",
-                grade="5th grade",
-                n_slides=2,
-            )
+    async def test_generate_presentation_semantic_cache_hit(
+        self,
+        mock_engine: LLMEngine,
+        sample_presentation: Presentation,
+    ):
+        """Test that a semantic cache hit is returned without generating."""
+
+        async def lookup_presentation(_request):
+            return sample_presentation
 
-            with pytest.raises(LLMGenerationError) as exc_info:
-                await engine.generate_presentation(request)
+        semantic_cache = SimpleNamespace(lookup_presentation=lookup_presentation)
 
-            assert "failed to generate" in str(exc_info.value).lower()
+        request = LessonRequest(topic="Photosynthesis basics", grade="7th grade", n_slides=3)
+
+        with patch.object(llm_engine_module, "get_semantic_cache", return_value=semantic_cache):
+            result = await mock_engine.generate_presentation(request)
+
+        assert result == sample_presentation
+        mock_engine.stream_presentation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_presentation_semantic_cache_miss_stores_result(
+        self,
+        photosynthesis_request: LessonRequest,
+        mock_engine: LLMEngine,
+    ):
+        """Test that a generated presentation is stored after a semantic cache miss."""
+        semantic_cache = MagicMock()
+        semantic_cache.lookup_presentation = AsyncMock(return_value=None)
+        semantic_cache.store_presentation = AsyncMock()
+
+        with patch.object(llm_engine_module, "get_semantic_cache", return_value=semantic_cache):
+            result = await mock_engine.generate_presentation(photosynthesis_request)
+
+        semantic_cache.store_presentation.assert_awaited_once_with(photosynthesis_request, result)
+
+
+class TestGeneratePresentations:
+    """Tests for batch presentation generation."""
+
+    @pytest.mark.asyncio
+    async def test_generate_presentations_keeps_order_and_errors(
+        self,
+        make_engine,
+        sample_presentation: Presentation,
+    ):
+        """Test that results follow request order and failures are returned in place."""
+
+        async def mock_generate(request):
+            if request.topic == "Broken":
+                raise LLMGenerationError("API Error")
+            return sample_presentation
+
+        engine = make_engine(generate_presentation=mock_generate)
+
+        requests = [
+            LessonRequest(topic="Photosynthesis", grade="7th grade", n_slides=3),
+            LessonRequest(topic="Broken", grade="7th grade", n_slides=3),
+        ]
+
+        results = await engine.generate_presentations(requests, max_concurrency=1)
+
+        assert results[0] is sample_presentation
+        assert isinstance(results[1], LLMGenerationError)
 
 
 class TestStreamPresentation:
     """Tests for presentation streaming."""
 
     @pytest.mark.asyncio
-    async def test_stream_presentation_yields_presentations(
+    async def test_stream_presentation_yields_slides(
         self,
-        sample_presentation: Presentation,
+        math_request: LessonRequest,
+        llm_env: SimpleNamespace,
+        make_engine,
+    ):
+        """Test that stream_presentation yields slides in presentation order."""
+        llm_env.settings.LLM_MAX_CONCURRENCY = 2
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            return Slide(type=slide_type, title="Title", content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+
+        results = []
+        async for slide in engine.stream_presentation(math_request):
+            results.append(slide)
+
+        assert [slide.type for slide in results] == [
+            SlideType.TITLE,
+            SlideType.AGENDA,
+            SlideType.CONTENT,
+            SlideType.CONTENT,
+            SlideType.CONCLUSION,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_starts_title_and_agenda_first(
+        self,
+        math_request: LessonRequest,
+        llm_env: SimpleNamespace,
+        make_engine,
     ):
-        """Test that stream_presentation yields Presentation objects."""
-        with patch("app.services.llm_engine.settings") as mock_settings, patch(
-            "app.services.llm_engine.ChatGoogleGenerativeAI"
-        ) as mock_gemini:
-            mock_settings.get_llm_provider.return_value = "google"
-            mock_settings.GOOGLE_API_KEY = "test-key"
-            mock_settings.DEFAULT_TEMPERATURE = 0.5
-            mock_settings.DEFAULT_TIMEOUT = None
-            mock_settings.DEFAULT_MAX_RETRIES = 2
-
-            # Mock async generator
-            async def mock_astream(_):
-                yield sample_presentation
-
-            mock_chain = MagicMock()
-            mock_chain.astream = mock_astream
-
-            mock_llm_instance = MagicMock()
-            mock_gemini.return_value = mock_llm_instance
-
-            engine = LLMEngine(provider="google")
-            engine._build_chain = MagicMock(return_value=mock_chain)
-
-            request = LessonRequest(
-                topic="Math",
-                grade="5th grade",
-                n_slides=2,
+        """Test that title and agenda calls don't queue behind content slides."""
+        llm_env.settings.LLM_MAX_CONCURRENCY = 1
+        started = []
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            started.append(slide_type)
+            return Slide(type=slide_type, title="Title", content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+
+        async for _ in engine.stream_presentation(math_request):
+            pass
+
+        assert started == [
+            SlideType.TITLE,
+            SlideType.AGENDA,
+            SlideType.CONTENT,
+            SlideType.CONTENT,
+            SlideType.CONCLUSION,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_starts_meta_slides_first(
+        self,
+        math_request: LessonRequest,
+        llm_env: SimpleNamespace,
+        make_engine,
+    ):
+        """Test that the batched meta call doesn't queue behind content slides."""
+        llm_env.settings.LLM_MAX_CONCURRENCY = 1
+        llm_env.settings.LLM_BATCH_META_SLIDES = True
+        started = []
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            started.append(slide_type.value)
+            return Slide(type=slide_type, title="Title", content="Content")
+
+        async def mock_generate_meta_slides(_request, _subtopics, _agenda_items):
+            started.append("meta")
+            return MetaSlides(
+                title=Slide(type=SlideType.TITLE, title="Title", content="Content"),
+                agenda=Slide(type=SlideType.AGENDA, title="Agenda", content="Content"),
+                conclusion=Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
             )
 
-            results = []
-            async for chunk in engine.stream_presentation(request):
-                results.append(chunk)
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+            _generate_meta_slides=mock_generate_meta_slides,
+        )
+
+        async for _ in engine.stream_presentation(math_request):
+            pass
+
+        assert started == ["meta", SlideType.CONTENT.value, SlideType.CONTENT.value]
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_counts_planned_subtopics(self, make_engine):
+        """Test that content slides are numbered against the subtopics actually planned."""
+        content_calls = []
+
+        async def mock_generate_slide(_request, slide_type, **kwargs):
+            if slide_type == SlideType.CONTENT:
+                content_calls.append(kwargs)
+            return Slide(type=slide_type, title="Title", content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+        # Four slides requested, but only two subtopics planned
+        request = LessonRequest(topic="Math", grade="5th grade", n_slides=4)
+
+        async for _ in engine.stream_presentation(request):
+            pass
+
+        assert [call["total_content_slides"] for call in content_calls] == [2, 2]
+        assert [call["include_question"] for call in content_calls] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_keeps_order_when_generated_concurrently(
+        self, make_engine, math_request: LessonRequest
+    ):
+        """Test that slides finishing out of order are still yielded in order."""
+        in_flight = 0
+        max_in_flight = 0
+        delays = {
+            SlideType.TITLE: 0.03,
+            SlideType.AGENDA: 0.02,
+            SlideType.CONTENT: 0.01,
+            SlideType.CONCLUSION: 0,
+        }
+
+        async def mock_generate_slide(_request, slide_type, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(delays[slide_type])
+            in_flight -= 1
+            title = kwargs.get("subtopic", slide_type.value)
+            return Slide(type=slide_type, title=title, content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+
+        titles = [slide.title async for slide in engine.stream_presentation(math_request)]
+
+        assert titles == ["title", "agenda", "Numbers", "Shapes", "conclusion"]
+        assert max_in_flight == 5
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_batches_content_slides(
+        self,
+        math_request: LessonRequest,
+        llm_env: SimpleNamespace,
+        make_engine,
+    ):
+        """Test that content slides come from one call when batching is enabled."""
+        llm_env.settings.LLM_BATCH_CONTENT_SLIDES = True
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            return Slide(type=slide_type, title=slide_type.value, content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=AsyncMock(side_effect=mock_generate_slide),
+            _generate_content_slides=AsyncMock(
+                return_value=[
+                    Slide(type=SlideType.CONTENT, title="Numbers", content="Content"),
+                    Slide(type=SlideType.CONTENT, title="Shapes", content="Content"),
+                ]
+            ),
+        )
+
+        titles = [slide.title async for slide in engine.stream_presentation(math_request)]
+
+        assert titles == ["title", "agenda", "Numbers", "Shapes", "conclusion"]
+        engine._generate_content_slides.assert_awaited_once_with(
+            math_request, ["Numbers", "Shapes"], 1
+        )
+        assert engine._generate_single_slide.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_batches_meta_slides(
+        self,
+        math_request: LessonRequest,
+        llm_env: SimpleNamespace,
+        make_engine,
+    ):
+        """Test that title, agenda, and conclusion come from one call when enabled."""
+        llm_env.settings.LLM_BATCH_META_SLIDES = True
+
+        async def mock_generate_slide(_request, slide_type, **kwargs):
+            return Slide(type=slide_type, title=kwargs["subtopic"], content="Content")
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=AsyncMock(side_effect=mock_generate_slide),
+            _generate_meta_slides=AsyncMock(
+                return_value=MetaSlides(
+                    title=Slide(type=SlideType.TITLE, title="title", content="Content"),
+                    agenda=Slide(type=SlideType.AGENDA, title="agenda", content="Content"),
+                    conclusion=Slide(
+                        type=SlideType.CONCLUSION, title="conclusion", content="Content"
+                    ),
+                )
+            ),
+        )
+
+        titles = [slide.title async for slide in engine.stream_presentation(math_request)]
+
+        assert titles == ["title", "agenda", "Numbers", "Shapes", "conclusion"]
+        engine._generate_meta_slides.assert_awaited_once_with(
+            math_request, ["Numbers", "Shapes"], "- Numbers\n- Shapes"
+        )
+        assert engine._generate_single_slide.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_failure_cancels_pending_slides(
+        self, make_engine, math_request: LessonRequest
+    ):
+        """Test that a failed slide stops slides still waiting to be yielded."""
+        title_cancelled = False
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            nonlocal title_cancelled
+            if slide_type == SlideType.CONTENT:
+                raise Exception("API Error")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                title_cancelled = title_cancelled or slide_type == SlideType.TITLE
+                raise
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+
+        async def consume():
+            async for _ in engine.stream_presentation(math_request):
+                pass
 
-            assert len(results) == 1
-            assert isinstance(results[0], Presentation)
+        with pytest.raises(LLMGenerationError) as exc_info:
+            await asyncio.wait_for(consume(), timeout=1)
+
+        assert "api error" in str(exc_info.value).lower()
+        assert title_cancelled
 
     @pytest.mark.asyncio
-    async def test_stream_presentation_error(self):
+    async def test_stream_presentation_consumer_cancel_is_not_a_slide_error(
+        self, make_engine, math_request: LessonRequest
+    ):
+        """Test that cancelling the consumer as a slide fails still cancels the consumer."""
+        fail_content = asyncio.Event()
+
+        async def mock_generate_slide(_request, slide_type, **_kwargs):
+            if slide_type == SlideType.CONTENT:
+                await fail_content.wait()
+                raise Exception("API Error")
+            await asyncio.Event().wait()
+
+        engine = make_engine(
+            _plan_agenda=_plan_numbers_and_shapes,
+            _generate_single_slide=mock_generate_slide,
+        )
+
+        async def consume():
+            async for _ in engine.stream_presentation(math_request):
+                pass
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)  # Let the consumer block on the title slide
+
+        fail_content.set()
+        consumer.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+
+    @pytest.mark.asyncio
+    async def test_stream_presentation_error(self, make_engine, math_request: LessonRequest):
         """Test that streaming errors are wrapped in LLMGenerationError."""
-        with patch("app.services.llm_engine.settings") as mock_settings, patch(
-            "app.services.llm_engine.ChatGoogleGenerativeAI"
-        ) as mock_gemini:
-            mock_settings.get_llm_provider.return_value = "google"
-            mock_settings.GOOGLE_API_KEY = "test-key"
-            mock_settings.DEFAULT_TEMPERATURE = 0.5
-            mock_settings.DEFAULT_TIMEOUT = None
-            mock_settings.DEFAULT_MAX_RETRIES = 2
-
-            # Mock async generator that raises error
-            async def mock_astream(_):
-                raise Exception("Stream error")
-                yield  # Make it a generator
-
-            mock_chain = MagicMock()
-            mock_chain.astream = mock_astream
-
-            mock_llm_instance = MagicMock()
-            mock_gemini.return_value = mock_llm_instance
-
-            engine = LLMEngine(provider="google")
-            engine._build_chain = MagicMock(return_value=mock_chain)
-
-            request = LessonRequest(
-                topic="Math",
-                grade="5th grade",
-                n_slides=2,
+
+        async def failing_plan_agenda(_request):
+            raise Exception("Stream error")
+
+        engine = make_engine(_plan_agenda=failing_plan_agenda)
+
+        with pytest.raises(LLMGenerationError) as exc_info:
+            async for _ in engine.stream_presentation(math_request):
+                pass
+
+        assert "failed to stream" in str(exc_info.value).lower()
+
+
+class TestEnsureType:
+    """Tests for correcting the type of generated slides."""
+
+    def test_ensure_type_keeps_matching_slide(self):
+        """Test that a slide with the expected type is returned unchanged."""
+        slide = Slide(type=SlideType.TITLE, title="Math", content="Welcome")
+
+        assert LLMEngine._ensure_type(slide, SlideType.TITLE) is slide
+
+    def test_ensure_type_updates_type(self):
+        """Test that a mismatched type is replaced."""
+        slide = Slide(type=SlideType.CONTENT, title="Math", content="Welcome")
+
+        result = LLMEngine._ensure_type(slide, SlideType.TITLE)
+
+        assert result.type == SlideType.TITLE
+        assert result.title == slide.title
+
+    def test_ensure_type_rejects_question_on_non_content_slide(self, sample_question: Question):
+        """Test that moving a question onto a non-content slide fails validation."""
+        slide = Slide(
+            type=SlideType.CONTENT,
+            title="Math",
+            content="Welcome",
+            question=sample_question,
+        )
+
+        with pytest.raises(ValidationError):
+            LLMEngine._ensure_type(slide, SlideType.CONCLUSION)
+
+
+class TestGenerateContentSlides:
+    """Tests for single-call content slide generation."""
+
+    @pytest.mark.asyncio
+    async def test_generate_content_slides_count_mismatch(
+        self, make_engine, math_request: LessonRequest
+    ):
+        """Test that a response with the wrong number of slides raises LLMValidationError."""
+
+        async def ainvoke(_variables):
+            return ContentSlides(
+                slides=[Slide(type=SlideType.CONTENT, title="Numbers", content="Content")]
             )
 
-            with pytest.raises(LLMGenerationError) as exc_info:
-                async for _ in engine.stream_presentation(request):
-                    pass
+        chain = SimpleNamespace(ainvoke=ainvoke)
+
+        engine = make_engine(chain=chain)
+
+        with pytest.raises(LLMValidationError) as exc_info:
+            await engine._generate_content_slides(math_request, ["Numbers", "Shapes"], 1)
+
+        assert "expected 2 content slides" in str(exc_info.value).lower()
+
+
+class TestResponseCaching:
+    """Tests for exact-match caching of LLM calls."""
+
+    @pytest.mark.asyncio
+    async def test_generate_single_slide_uses_cache(self, make_engine, math_request: LessonRequest):
+        """Test that an identical slide request is served without calling the LLM."""
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(
+            return_value=Slide(type=SlideType.TITLE, title="Math", content="Welcome")
+        )
+
+        engine = make_engine(chain=chain)
+
+        first = await engine._generate_single_slide(math_request, SlideType.TITLE)
+        second = await engine._generate_single_slide(math_request, SlideType.TITLE)
+
+        assert first == second
+        chain.ainvoke.assert_awaited_once()
+
+    def test_cache_key_normalizes_request(self, make_engine, photosynthesis_request: LessonRequest):
+        """Test that case and whitespace differences map to the same cache key."""
+        engine = make_engine()
+        variant = LessonRequest(topic="  photosynthesis ", grade="7th  Grade", n_slides=3)
+        other = LessonRequest(topic="Photosynthesis", grade="7th grade", n_slides=4)
+
+        key = engine._cache_key(SlideType.TITLE.value, photosynthesis_request)
+
+        assert engine._cache_key(SlideType.TITLE.value, variant) == key
+        assert engine._cache_key(SlideType.TITLE.value, other) != key
+        assert engine._cache_key(SlideType.AGENDA.value, photosynthesis_request) != key
+
+    @pytest.mark.asyncio
+    async def test_plan_agenda_uses_cache(self, make_engine, math_request: LessonRequest):
+        """Test that an identical agenda request is served without calling the LLM."""
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(return_value=Agenda(subtopics=["Numbers", "Shapes"]))
+
+        engine = make_engine(chain=chain)
+
+        first = await engine._plan_agenda(math_request)
+        second = await engine._plan_agenda(math_request)
+
+        assert first == second == ["Numbers", "Shapes"]
+        chain.ainvoke.assert_awaited_once()
+
+    @pytest.fixture
+    def semantic_cache(self, redisvl_env: SimpleNamespace):
+        """Semantic cache over faked redisvl classes, served by get_semantic_cache."""
+        semantic_cache = SemanticResponseCache(redis_url="redis://localhost:6379")
+        with patch.object(llm_engine_module, "get_semantic_cache", return_value=semantic_cache):
+            yield redisvl_env.caches["agendas"]
+
+    @pytest.mark.asyncio
+    async def test_plan_agenda_uses_semantic_cache(
+        self, make_engine, llm_env: SimpleNamespace, semantic_cache: MagicMock
+    ):
+        """Test that an agenda planned for a similar request is reused when enabled."""
+        llm_env.settings.SEMANTIC_CACHE_AGENDAS = True
+        semantic_cache.acheck.return_value = [
+            {"response": Agenda(subtopics=["Numbers", "Shapes"]).model_dump_json()}
+        ]
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock()
+
+        engine = make_engine(chain=chain)
+        request = LessonRequest(topic="Basic math", grade="5th grade", n_slides=2)
+
+        subtopics = await engine._plan_agenda(request)
+
+        assert subtopics == ["Numbers", "Shapes"]
+        chain.ainvoke.assert_not_awaited()
+        filter_expression = semantic_cache.acheck.await_args.kwargs["filter_expression"]
+        assert str(filter_expression) == r"(@grade:{5th\ grade} @n_slides:{2})"
+
+    @pytest.mark.asyncio
+    async def test_plan_agenda_semantic_miss_stores_agenda(
+        self,
+        make_engine,
+        llm_env: SimpleNamespace,
+        semantic_cache: MagicMock,
+        math_request: LessonRequest,
+    ):
+        """Test that a planned agenda is stored after a semantic cache miss."""
+        llm_env.settings.SEMANTIC_CACHE_AGENDAS = True
+        semantic_cache.acheck.return_value = []
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(return_value=Agenda(subtopics=["Numbers", "Shapes"]))
+
+        engine = make_engine(chain=chain)
+
+        await engine._plan_agenda(math_request)
+
+        kwargs = semantic_cache.astore.await_args.kwargs
+        assert Agenda.model_validate_json(kwargs["response"]).subtopics == ["Numbers", "Shapes"]
+        assert kwargs["filters"] == {"grade": "5th grade", "n_slides": "2"}
+
+    @pytest.mark.asyncio
+    async def test_plan_agenda_skips_semantic_cache_by_default(
+        self, make_engine, semantic_cache: MagicMock, math_request: LessonRequest
+    ):
+        """Test that agendas don't touch the semantic cache unless enabled."""
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(return_value=Agenda(subtopics=["Numbers", "Shapes"]))
+
+        engine = make_engine(chain=chain)
+
+        await engine._plan_agenda(math_request)
+
+        semantic_cache.acheck.assert_not_awaited()
+        semantic_cache.astore.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_plan_agenda_truncates_to_n_slides(
+        self, make_engine, math_request: LessonRequest
+    ):
+        """Test that extra planned subtopics are dropped."""
+
+        async def ainvoke(_variables):
+            return Agenda(subtopics=["Numbers", "Shapes", "Fractions"])
+
+        chain = SimpleNamespace(ainvoke=ainvoke)
+
+        engine = make_engine(chain=chain)
 
-            assert "failed to stream" in str(exc_info.value).lower()
+        assert await engine._plan_agenda(math_request) == ["Numbers", "Shapes"]
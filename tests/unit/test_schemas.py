@@ -1,16 +1,33 @@
 import pytest
 from pydantic import ValidationError
 
-from app.schemas import LessonRequest, Presentation, Question, Slide
+from app.schemas import Agenda, LessonRequest, Presentation, Question, Slide
 from app.schemas.enums import SlideType
 
+# One character past each field's max_length
+_TOPIC_OVERFLOW = "A" * 101
+_CONTEXT_OVERFLOW = "A" * 2001
+_TITLE_OVERFLOW = "A" * 201
+
+# Valid slides shared by the presentation structure tests
+_TITLE = Slide(type=SlideType.TITLE, title="Title", content="Content")
+_AGENDA = Slide(type=SlideType.AGENDA, title="Agenda", content="Content")
+_CONTENT = Slide(type=SlideType.CONTENT, title="Content", content="Content")
+_CONCLUSION = Slide(type=SlideType.CONCLUSION, title="End", content="Content")
+
+
+def has_error_loc(exc_info: pytest.ExceptionInfo[ValidationError], loc_part: str) -> bool:
+    """Check whether any validation error points at the given field."""
+    errors = exc_info.value.errors(include_url=False, include_context=False, include_input=False)
+    return any(loc_part in error["loc"] for error in errors)
+
 
 class TestLessonRequest:
     """Tests for LessonRequest schema validation."""
 
     def test_valid_request(self, sample_request_data: dict):
         """Test that valid data creates a request successfully."""
-        request = LessonRequest(**sample_request_data)
+        request = LessonRequest.model_validate(sample_request_data)
 
         assert request.topic == "Photosynthesis"
         assert request.grade == "7th grade"
@@ -19,7 +36,7 @@ class TestLessonRequest:
 
     def test_minimal_request(self, sample_request_minimal: dict):
         """Test request with only required fields."""
-        request = LessonRequest(**sample_request_minimal)
+        request = LessonRequest.model_validate(sample_request_minimal)
 
         assert request.topic == "Math"
         assert request.grade == "5th grade"
@@ -35,26 +52,18 @@ class TestLessonRequest:
         )
         assert request.topic == "Photosynthesis"
 
-    def test_topic_too_short(self):
-        """Test that topic with less than 3 chars fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="AB", grade="7th grade", n_slides=3)
-
-        assert "topic" in str(exc_info.value)
-
-    def test_topic_too_long(self):
-        """Test that topic exceeding 100 chars fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="A" * 101, grade="7th grade", n_slides=3)
-
-        assert "topic" in str(exc_info.value)
-
-    def test_topic_empty_after_strip(self):
-        """Test that topic with only whitespace fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="   ", grade="7th grade", n_slides=3)
-
-        assert "empty" in str(exc_info.value).lower()
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"topic": "   ", "grade": "7th grade", "n_slides": 3},
+            {"topic": "Math", "grade": "   ", "n_slides": 3},
+        ],
+        ids=["topic", "grade"],
+    )
+    def test_empty_after_strip(self, kwargs: dict):
+        """Test that topic or grade with only whitespace fails."""
+        with pytest.raises(ValidationError, match="cannot be empty"):
+            LessonRequest.model_validate(kwargs)
 
     def test_grade_whitespace_sanitization(self):
         """Test that grade whitespace is stripped."""
@@ -65,13 +74,6 @@ class TestLessonRequest:
         )
         assert request.grade == "7th grade"
 
-    def test_grade_empty_after_strip(self):
-        """Test that grade with only whitespace fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="Math", grade="   ", n_slides=3)
-
-        assert "empty" in str(exc_info.value).lower()
-
     def test_context_sanitization(self):
         """Test that context whitespace is stripped."""
         request = LessonRequest(
@@ -82,31 +84,37 @@ class TestLessonRequest:
         )
         assert request.context == "Some context"
 
-    def test_context_too_long(self):
-        """Test that context exceeding 2000 chars fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(
-                topic="Math",
-                grade="7th grade",
-                context="A" * 2001,
-                n_slides=3,
-            )
-
-        assert "context" in str(exc_info.value)
-
-    def test_n_slides_minimum(self):
-        """Test that n_slides must be at least 1."""
-        with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="Math", grade="7th grade", n_slides=0)
-
-        assert "n_slides" in str(exc_info.value)
-
-    def test_n_slides_maximum(self):
-        """Test that n_slides cannot exceed 15."""
+    @pytest.mark.parametrize(
+        "kwargs,loc",
+        [
+            ({"topic": "AB", "grade": "7th grade", "n_slides": 3}, "topic"),
+            ({"topic": _TOPIC_OVERFLOW, "grade": "7th grade", "n_slides": 3}, "topic"),
+            (
+                {
+                    "topic": "Math",
+                    "grade": "7th grade",
+                    "context": _CONTEXT_OVERFLOW,
+                    "n_slides": 3,
+                },
+                "context",
+            ),
+            ({"topic": "Math", "grade": "7th grade", "n_slides": 0}, "n_slides"),
+            ({"topic": "Math", "grade": "7th grade", "n_slides": 16}, "n_slides"),
+        ],
+        ids=[
+            "topic-too-short",
+            "topic-too-long",
+            "context-too-long",
+            "n-slides-below-minimum",
+            "n-slides-above-maximum",
+        ],
+    )
+    def test_invalid_field(self, kwargs: dict, loc: str):
+        """Test that out-of-range fields fail on the offending field."""
         with pytest.raises(ValidationError) as exc_info:
-            LessonRequest(topic="Math", grade="7th grade", n_slides=16)
+            LessonRequest.model_validate(kwargs)
 
-        assert "n_slides" in str(exc_info.value)
+        assert has_error_loc(exc_info, loc)
 
     def test_n_slides_valid_range(self):
         """Test n_slides at boundary values."""
@@ -151,47 +159,36 @@ class TestQuestion:
 
     def test_answer_not_in_options(self):
         """Test that answer not matching any option fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            Question(
-                prompt="What is 2+2?",
-                options=["3", "4", "5", "6"],
-                answer="7",
-            )
-
-        assert "answer" in str(exc_info.value).lower()
-
-    def test_prompt_too_short(self):
-        """Test that prompt with less than 10 chars fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            Question(
-                prompt="Short?",
-                options=["A", "B"],
-                answer="A",
+        with pytest.raises(ValidationError, match="must match one of the provided options"):
+            Question.model_validate(
+                {"prompt": "What is 2+2?", "options": ["3", "4", "5", "6"], "answer": "7"}
             )
 
-        assert "prompt" in str(exc_info.value)
-
-    def test_options_minimum(self):
-        """Test that at least 2 options are required."""
+    @pytest.mark.parametrize(
+        "kwargs,loc",
+        [
+            ({"prompt": "Short?", "options": ["A", "B"], "answer": "A"}, "prompt"),
+            (
+                {"prompt": "What is the answer?", "options": ["Only one"], "answer": "Only one"},
+                "options",
+            ),
+            (
+                {
+                    "prompt": "What is the answer?",
+                    "options": ["A", "B", "C", "D", "E", "F"],
+                    "answer": "A",
+                },
+                "options",
+            ),
+        ],
+        ids=["prompt-too-short", "too-few-options", "too-many-options"],
+    )
+    def test_invalid_field(self, kwargs: dict, loc: str):
+        """Test that a short prompt or an out-of-range option count fails."""
         with pytest.raises(ValidationError) as exc_info:
-            Question(
-                prompt="What is the answer?",
-                options=["Only one"],
-                answer="Only one",
-            )
-
-        assert "options" in str(exc_info.value)
-
-    def test_options_maximum(self):
-        """Test that maximum 5 options allowed."""
-        with pytest.raises(ValidationError) as exc_info:
-            Question(
-                prompt="What is the answer?",
-                options=["A", "B", "C", "D", "E", "F"],
-                answer="A",
-            )
+            Question.model_validate(kwargs)
 
-        assert "options" in str(exc_info.value)
+        assert has_error_loc(exc_info, loc)
 
 
 class TestSlide:
@@ -234,74 +231,38 @@ class TestSlide:
         assert slide.question is not None
         assert slide.question.prompt == sample_question.prompt
 
-    def test_title_slide_no_question(self, sample_question: Question):
-        """Test that title slide cannot have question."""
-        with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.TITLE,
-                title="Title Slide",
-                content="Content",
-                question=sample_question,
-            )
-
-        assert "question" in str(exc_info.value).lower()
-
-    def test_agenda_slide_no_question(self, sample_question: Question):
-        """Test that agenda slide cannot have question."""
-        with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.AGENDA,
-                title="Agenda",
-                content="Content",
-                question=sample_question,
-            )
-
-        assert "question" in str(exc_info.value).lower()
-
-    def test_conclusion_slide_no_question(self, sample_question: Question):
-        """Test that conclusion slide cannot have question."""
-        with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.CONCLUSION,
-                title="Summary",
-                content="Content",
-                question=sample_question,
-            )
-
-        assert "question" in str(exc_info.value).lower()
-
-    def test_title_too_long(self):
-        """Test that title exceeding 200 chars fails."""
-        with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.CONTENT,
-                title="A" * 201,
-                content="Content",
-            )
-
-        assert "title" in str(exc_info.value)
-
-    def test_empty_title(self):
-        """Test that empty title fails."""
+    @pytest.mark.parametrize(
+        "slide_type",
+        [SlideType.TITLE, SlideType.AGENDA, SlideType.CONCLUSION],
+        ids=["title", "agenda", "conclusion"],
+    )
+    def test_non_content_slide_rejects_question(
+        self, slide_type: SlideType, sample_question: Question
+    ):
+        """Test that only content slides can have a question."""
         with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.CONTENT,
-                title="",
-                content="Content",
-            )
+            Slide(type=slide_type, title="Slide", content="Content", question=sample_question)
 
-        assert "title" in str(exc_info.value)
-
-    def test_empty_content(self):
-        """Test that empty content fails."""
+        errors = exc_info.value.errors(
+            include_url=False, include_context=False, include_input=False
+        )
+        assert any("only be included in content slides" in error["msg"] for error in errors)
+
+    @pytest.mark.parametrize(
+        "kwargs,loc",
+        [
+            ({"title": _TITLE_OVERFLOW, "content": "Content"}, "title"),
+            ({"title": "", "content": "Content"}, "title"),
+            ({"title": "Title", "content": ""}, "content"),
+        ],
+        ids=["title-too-long", "empty-title", "empty-content"],
+    )
+    def test_invalid_field(self, kwargs: dict, loc: str):
+        """Test that an overlong or empty title, or empty content, fails."""
         with pytest.raises(ValidationError) as exc_info:
-            Slide(
-                type=SlideType.CONTENT,
-                title="Title",
-                content="",
-            )
+            Slide(type=SlideType.CONTENT, **kwargs)
 
-        assert "content" in str(exc_info.value)
+        assert has_error_loc(exc_info, loc)
 
 
 class TestPresentation:
@@ -315,110 +276,72 @@ class TestPresentation:
 
     def test_presentation_structure_first_slide_title(self):
         """Test that first slide must be title."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="First slide must be of type"):
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.CONTENT, title="Wrong", content="Content"),
-                    Slide(type=SlideType.AGENDA, title="Agenda", content="Content"),
-                    Slide(type=SlideType.CONTENT, title="Content", content="Content"),
-                    Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
-                ],
+                slides=[_CONTENT, _AGENDA, _CONTENT, _CONCLUSION],
             )
 
-        assert "title" in str(exc_info.value).lower()
-
     def test_presentation_structure_second_slide_agenda(self):
         """Test that second slide must be agenda."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="Second slide must be of type"):
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.TITLE, title="Title", content="Content"),
-                    Slide(type=SlideType.CONTENT, title="Wrong", content="Content"),
-                    Slide(type=SlideType.CONTENT, title="Content", content="Content"),
-                    Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
-                ],
+                slides=[_TITLE, _CONTENT, _CONTENT, _CONCLUSION],
             )
 
-        assert "agenda" in str(exc_info.value).lower()
-
     def test_presentation_structure_last_slide_conclusion(self):
         """Test that last slide must be conclusion."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="Last slide must be of type"):
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.TITLE, title="Title", content="Content"),
-                    Slide(type=SlideType.AGENDA, title="Agenda", content="Content"),
-                    Slide(type=SlideType.CONTENT, title="Content", content="Content"),
-                    Slide(type=SlideType.CONTENT, title="Wrong", content="Content"),
-                ],
+                slides=[_TITLE, _AGENDA, _CONTENT, _CONTENT],
             )
 
-        assert "conclusion" in str(exc_info.value).lower()
-
     def test_presentation_middle_slides_must_be_content(self):
         """Test that middle slides must be content type."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="Slide at position 3 must be of type"):
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.TITLE, title="Title", content="Content"),
-                    Slide(type=SlideType.AGENDA, title="Agenda", content="Content"),
-                    Slide(type=SlideType.TITLE, title="Wrong", content="Content"),  # Wrong type
-                    Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
-                ],
+                slides=[_TITLE, _AGENDA, _TITLE, _CONCLUSION],
             )
 
-        assert "content" in str(exc_info.value).lower()
-
     def test_presentation_minimum_slides(self):
         """Test that presentation needs at least title, agenda, content, conclusion."""
         with pytest.raises(ValidationError) as exc_info:
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.TITLE, title="Title", content="Content"),
-                    Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
-                ],
+                slides=[_TITLE, _CONCLUSION],
             )
 
         # Should fail because missing agenda and content
-        assert exc_info.value is not None
+        assert has_error_loc(exc_info, "slides")
 
     def test_presentation_max_one_question(self, sample_question: Question):
         """Test that presentation can have at most one question."""
-        with pytest.raises(ValidationError) as exc_info:
+        # Each slide is valid on its own; only the presentation-level rule is under test
+        first, second = (
+            Slide.model_construct(
+                type=SlideType.CONTENT,
+                title=title,
+                content="Content",
+                question=sample_question,
+            )
+            for title in ("Content 1", "Content 2")
+        )
+
+        with pytest.raises(ValidationError, match="at most one question"):
             Presentation(
                 topic="Test",
                 grade="7th",
-                slides=[
-                    Slide(type=SlideType.TITLE, title="Title", content="Content"),
-                    Slide(type=SlideType.AGENDA, title="Agenda", content="Content"),
-                    Slide(
-                        type=SlideType.CONTENT,
-                        title="Content 1",
-                        content="Content",
-                        question=sample_question,
-                    ),
-                    Slide(
-                        type=SlideType.CONTENT,
-                        title="Content 2",
-                        content="Content",
-                        question=sample_question,  # Second question - should fail
-                    ),
-                    Slide(type=SlideType.CONCLUSION, title="End", content="Content"),
-                ],
+                slides=[_TITLE, _AGENDA, first, second, _CONCLUSION],
             )
 
-        assert "question" in str(exc_info.value).lower()
-
     def test_presentation_empty_slides(self):
         """Test that empty slides list fails."""
         with pytest.raises(ValidationError):
@@ -427,3 +350,18 @@ class TestPresentation:
                 grade="7th",
                 slides=[],
             )
+
+
+class TestAgenda:
+    """Tests for Agenda schema validation."""
+
+    def test_valid_agenda(self):
+        """Test that an agenda keeps its subtopics in order."""
+        agenda = Agenda(subtopics=["Numbers", "Shapes"])
+
+        assert agenda.subtopics == ["Numbers", "Shapes"]
+
+    def test_empty_agenda_fails(self):
+        """Test that an agenda needs at least one subtopic."""
+        with pytest.raises(ValidationError):
+            Agenda(subtopics=[])
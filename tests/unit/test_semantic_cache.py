@@ -0,0 +1,178 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.semantic_cache as semantic_cache_module
+from app.schemas import LessonRequest, Presentation
+from app.services.semantic_cache import (
+    SemanticResponseCache,
+    close_semantic_cache,
+    get_semantic_cache,
+    open_semantic_cache,
+)
+
+
+@pytest.fixture
+def semantic_cache(redisvl_env: SimpleNamespace) -> SemanticResponseCache:
+    """Semantic cache built against the faked redisvl classes."""
+    return SemanticResponseCache(redis_url="redis://localhost:6379", ttl=60)
+
+
+class TestSemanticResponseCache:
+    """Tests for the redisvl-backed semantic cache."""
+
+    def test_builds_presentation_and_agenda_caches(
+        self, redisvl_env: SimpleNamespace, semantic_cache: SemanticResponseCache
+    ):
+        """Test that both caches share one vectorizer and filter on grade."""
+        vectorizer = redisvl_env.vectorizer_cls.return_value
+
+        assert set(redisvl_env.caches) == {"slides", "agendas"}
+        for call in redisvl_env.cache_cls.call_args_list:
+            assert call.kwargs["redis_url"] == "redis://localhost:6379"
+            assert call.kwargs["ttl"] == 60
+            assert call.kwargs["vectorizer"] is vectorizer
+            assert {"name": "grade", "type": "tag"} in call.kwargs["filterable_fields"]
+
+    @pytest.mark.asyncio
+    async def test_lookup_presentation_hit(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        photosynthesis_request: LessonRequest,
+        sample_presentation: Presentation,
+    ):
+        """Test that a cached presentation is returned for a similar request."""
+        slides_cache = redisvl_env.caches["slides"]
+        slides_cache.acheck.return_value = [{"response": sample_presentation.model_dump_json()}]
+
+        result = await semantic_cache.lookup_presentation(photosynthesis_request)
+
+        assert result == sample_presentation
+        kwargs = slides_cache.acheck.await_args.kwargs
+        assert kwargs["vector"] == [0.1, 0.2, 0.3]
+        assert str(kwargs["filter_expression"]) == r"@grade:{7th\ grade}"
+
+    @pytest.mark.asyncio
+    async def test_lookup_presentation_rejects_other_slide_count(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        sample_presentation: Presentation,
+    ):
+        """Test that a cached deck with a different number of slides is a miss."""
+        redisvl_env.caches["slides"].acheck.return_value = [
+            {"response": sample_presentation.model_dump_json()}
+        ]
+        request = LessonRequest(topic="Photosynthesis", grade="7th grade", n_slides=5)
+
+        assert await semantic_cache.lookup_presentation(request) is None
+
+    @pytest.mark.asyncio
+    async def test_lookup_presentation_describes_current_request(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        sample_presentation: Presentation,
+    ):
+        """Test that a hit carries the current request's topic, not the cached one's."""
+        redisvl_env.caches["slides"].acheck.return_value = [
+            {"response": sample_presentation.model_dump_json()}
+        ]
+        request = LessonRequest(topic="Photosynthesis basics", grade="7th grade", n_slides=3)
+
+        result = await semantic_cache.lookup_presentation(request)
+
+        assert result.topic == "Photosynthesis basics"
+        assert result.grade == "7th grade"
+        assert result.slides == sample_presentation.slides
+
+    @pytest.mark.asyncio
+    async def test_lookup_presentation_error_is_a_miss(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        photosynthesis_request: LessonRequest,
+    ):
+        """Test that a Redis failure is logged and treated as a miss."""
+        redisvl_env.caches["slides"].acheck.side_effect = ConnectionError("Redis down")
+
+        assert await semantic_cache.lookup_presentation(photosynthesis_request) is None
+
+    @pytest.mark.asyncio
+    async def test_store_presentation(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        photosynthesis_request: LessonRequest,
+        sample_presentation: Presentation,
+    ):
+        """Test that a presentation is stored as JSON tagged with its grade."""
+        await semantic_cache.store_presentation(photosynthesis_request, sample_presentation)
+
+        kwargs = redisvl_env.caches["slides"].astore.await_args.kwargs
+        assert kwargs["response"] == sample_presentation.model_dump_json()
+        assert kwargs["vector"] == [0.1, 0.2, 0.3]
+        assert kwargs["filters"] == {"grade": "7th grade"}
+
+    @pytest.mark.asyncio
+    async def test_requests_are_embedded_off_the_event_loop(
+        self,
+        redisvl_env: SimpleNamespace,
+        semantic_cache: SemanticResponseCache,
+        photosynthesis_request: LessonRequest,
+    ):
+        """Test that the synchronous embedding model runs in a worker thread."""
+        embed_threads = []
+
+        def embed(_text):
+            embed_threads.append(threading.get_ident())
+            return [0.1, 0.2, 0.3]
+
+        redisvl_env.vectorizer_cls.return_value.embed.side_effect = embed
+        redisvl_env.caches["slides"].acheck.return_value = []
+
+        await semantic_cache.lookup_presentation(photosynthesis_request)
+
+        assert embed_threads and threading.get_ident() not in embed_threads
+
+
+class TestSemanticCacheLifecycle:
+    """Tests for building and closing the shared semantic cache."""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_cache(self):
+        """Start each test with no shared semantic cache."""
+        semantic_cache_module._build_semantic_cache.cache_clear()
+        yield
+        semantic_cache_module._build_semantic_cache.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_redis_url(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that no cache is built when SEMANTIC_CACHE_REDIS_URL is unset."""
+        monkeypatch.setattr(semantic_cache_module.settings, "SEMANTIC_CACHE_REDIS_URL", None)
+
+        await open_semantic_cache()
+
+        assert get_semantic_cache() is None
+
+    @pytest.mark.asyncio
+    async def test_opened_on_startup_and_closed_on_shutdown(
+        self, redisvl_env: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the cache only exists between open and close, and is disconnected."""
+        monkeypatch.setattr(
+            semantic_cache_module.settings, "SEMANTIC_CACHE_REDIS_URL", "redis://localhost:6379"
+        )
+
+        assert get_semantic_cache() is None
+        redisvl_env.cache_cls.assert_not_called()
+
+        await open_semantic_cache()
+        assert isinstance(get_semantic_cache(), SemanticResponseCache)
+
+        await close_semantic_cache()
+        assert get_semantic_cache() is None
+        for cache in redisvl_env.caches.values():
+            cache.adisconnect.assert_awaited_once()